@@ -8,7 +8,8 @@ from Domain.Shapes.Curve import Curve
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Coordinates import Position3D
 from Domain.Utils.Enums import ObjectsTypes
-from copy import deepcopy
+from Domain.Management.RenderProxy import RenderProxy
+import numpy as np
 
 class LineClippingStrategy(ABC):
     def __init__(self) -> None:
@@ -18,6 +19,14 @@ class LineClippingStrategy(ABC):
     def clip(self, line: Line, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> Line | None:
         pass
     
+    @abstractmethod
+    def clipSegments(self, segments: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Clips a (M, 2, 2) batch of segments against the window rectangle at once.
+        Returns the clipped segments and the (M,) mask of the segments to keep
+        """
+        pass
+    
 
 class LiangBarskyStrategy(LineClippingStrategy):
     def __init__(self) -> None:
@@ -67,6 +76,29 @@ class LiangBarskyStrategy(LineClippingStrategy):
 
         return None
 
+    def clipSegments(self, segments: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        start = segments[:, 0]
+        delta = segments[:, 1] - segments[:, 0]
+
+        # (M, 4) parameters for the left, right, bottom and top borders
+        p = np.stack([-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]], axis=1)
+        q = np.stack([start[:, 0] - rectMin[0], rectMax[0] - start[:, 0], start[:, 1] - rectMin[1], rectMax[1] - start[:, 1]], axis=1)
+
+        # Parallel to a border and outside of it
+        rejected = np.any((p == 0) & (q < 0), axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = q / p
+
+        tMin = np.max(np.where(p < 0, t, 0.0), axis=1, initial=0.0)
+        tMax = np.min(np.where(p > 0, t, 1.0), axis=1, initial=1.0)
+
+        keep = ~rejected & (tMin < tMax)
+
+        clipped = np.stack([start + tMin[:, None] * delta, start + tMax[:, None] * delta], axis=1)
+
+        return clipped, keep
+
 class CohenSutherlandStrategy(LineClippingStrategy):
     def __init__(self) -> None:
         super().__init__()
@@ -170,393 +202,507 @@ class CohenSutherlandStrategy(LineClippingStrategy):
             return Line(Point(x0, y0, 0), Point(x1, y1, 0), line.name)
 
 
-class WeilerAthertonStrategy:
+    @staticmethod
+    def __outcodes(points: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> np.ndarray:
+        codes = np.zeros(len(points), dtype=np.int8)
+
+        codes[points[:, 1] > rectMax[1]] |= 8
+        codes[points[:, 1] < rectMin[1]] |= 4
+        codes[points[:, 0] > rectMax[0]] |= 2
+        codes[points[:, 0] < rectMin[0]] |= 1
+
+        return codes
+
+    def clipSegments(self, segments: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        clipped = np.array(segments, dtype=np.float64)
+
+        codes = np.stack([self.__outcodes(clipped[:, 0], rectMin, rectMax), self.__outcodes(clipped[:, 1], rectMin, rectMax)], axis=1)
+        keep = np.ones(len(clipped), dtype=bool)
+
+        # Each pass moves one outside endpoint of every pending segment to a border, 4 borders at most per endpoint
+        for _ in range(8):
+            accepted = (codes[:, 0] | codes[:, 1]) == 0
+            rejected = (codes[:, 0] & codes[:, 1]) != 0
+
+            keep &= ~rejected
+            pending = np.flatnonzero(keep & ~accepted)
+
+            if len(pending) == 0:
+                break
+
+            # The endpoint to move, the first one if it is outside
+            endpoint = np.where(codes[pending, 0] != 0, 0, 1)
+            code = codes[pending, endpoint]
+
+            moving = clipped[pending, endpoint]
+            other = clipped[pending, 1 - endpoint]
+            delta = other - moving
+
+            # Same priority of the borders as the single line version: top, bottom, right, left
+            border = np.where(code & 8, 3, np.where(code & 4, 2, np.where(code & 2, 1, 0)))
+            axis = np.where(border >= 2, 1, 0)
+            value = np.choose(border, [rectMin[0], rectMax[0], rectMin[1], rectMax[1]])
+
+            rows = np.arange(len(pending))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (value - moving[rows, axis]) / delta[rows, axis]
+
+            moved = moving + t[:, None] * delta
+            moved[rows, axis] = value
+
+            clipped[pending, endpoint] = moved
+            codes[pending, endpoint] = self.__outcodes(moved, rectMin, rectMax)
+
+        keep &= (codes[:, 0] | codes[:, 1]) == 0
+
+        return clipped, keep
+
+
+class PolygonClippingStrategy(ABC):
     def __init__(self) -> None:
         pass
-    
-    def __intersection_lb(self, p1: Position3D, p2: Position3D, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> list[str, Position3D, str, Position3D] | list[str, Position3D] | None:
-        if self.__wireframe_inside([p1, p2], win_bottom_left, win_top_right):
-            return None
-        
-        x0, y0, z0 = p1.axisX, p1.axisY, p1.axisZ
-        x1, y1, z1 = p2.axisX, p2.axisY, p2.axisZ
-        
-        dx = x1 - x0
-        dy = y1 - y0
-        xmax, ymax = win_top_right.axisX, win_top_right.axisY
-        xmin, ymin = win_bottom_left.axisX, win_bottom_left.axisY
 
-        p = [-dx, dx, -dy, dy]
-        q = [x0 - xmin, xmax - x0, y0 - ymin, ymax - y0]
-        # checks if line is parallel to border
-        if (
-            (p[0] == 0 and q[0] < 0)
-            or (p[1] == 0 and q[1] < 0)
-            or (p[2] == 0 and q[2] < 0)
-            or (p[3] == 0 and q[3] < 0)
-        ):
-            return None
+    @abstractmethod
+    def clip(self, polygon: WireFrame | RenderProxy, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> WireFrame | RenderProxy | None:
+        pass
 
-        # From outside to inside
-        zeta1 = [q[n] / p[n] for n in range(4) if p[n] < 0]
 
-        # From inside to outside
-        zeta2 = [q[n] / p[n] for n in range(4) if p[n] > 0]
-        
-        zeta1.append(0)
-        zeta2.append(1)
-        # from outside to inside
-        zeta1 = max(zeta1)
+class SutherlandHodgmanStrategy(PolygonClippingStrategy):
+    """
+    Clips the polygon against one border of the window at a time, each pass handles all edges at once.
+    Linear in the number of vertices, exact for convex polygons, concave ones may keep edges over the borders
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+    @staticmethod
+    def clipPolygon(vertices: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> np.ndarray:
+        """ Clips the (N, 2) vertices of a closed polygon, returns the (K, 2) clipped vertices """
+        # Axis, border value and side of the window (1 keeps greater values, -1 smaller)
+        borders = [(0, rectMin[0], 1), (0, rectMax[0], -1), (1, rectMin[1], 1), (1, rectMax[1], -1)]
+
+        for axis, value, side in borders:
+            if len(vertices) == 0:
+                break
+
+            current = vertices
+            following = np.roll(vertices, -1, axis=0)
+
+            currentInside = (current[:, axis] - value) * side >= 0
+            followingInside = (following[:, axis] - value) * side >= 0
+            crossing = currentInside != followingInside
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (value - current[:, axis]) / (following[:, axis] - current[:, axis])
+                intersection = current + t[:, None] * (following - current)
+
+            intersection[:, axis] = value
+
+            # Each edge emits its start if inside and then the crossing with the border, in order
+            candidates = np.stack([current, intersection], axis=1)
+            emitted = np.stack([currentInside, crossing], axis=1)
+
+            vertices = candidates[emitted]
 
-        # from inside to outside
-        zeta2 = min(zeta2)
+        return vertices
 
-        # Removes line if its completely out of window
-        if zeta1 > zeta2:
+    def clip(self, polygon: WireFrame | RenderProxy, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> WireFrame | RenderProxy | None:
+        rectMin = np.array([win_bottom_left.axisX, win_bottom_left.axisY], dtype=np.float64)
+        rectMax = np.array([win_top_right.axisX, win_top_right.axisY], dtype=np.float64)
+
+        clipped = self.clipPolygon(polygon.getPositionsArray()[:, :2], rectMin, rectMax)
+
+        if len(clipped) == 0:
             return None
 
-        if zeta1 != 0 and zeta2 != 1:
-            xn0 = x0 + dx * zeta1
-            yn0 = y0 + dy * zeta1
-            xn1 = x0 + dx * zeta2
-            yn1 = y0 + dy * zeta2
-            return ["out-in", Position3D(xn0, yn0, 1), "in_out", Position3D(xn1, yn1, 1)]
-
-        elif zeta1 == 0:
-            xn1 = x0 + dx * zeta2
-            yn1 = y0 + dy * zeta2
-            return ["in-out", Position3D(xn1, yn1, 1)]
-
-        elif zeta2 == 1:
-            xn0 = x0 + dx * zeta1
-            yn0 = y0 + dy * zeta1
-            return ["out-in", Position3D(xn0, yn0, 1)]
-        
-    
-    def __wireframe_inside(self, positions: list[Position3D], win_bottom_left: Position3D, win_top_right: Position3D) -> bool:
-        for position in positions:
-            if position.axisX < win_bottom_left.axisX or position.axisX > win_top_right.axisX or position.axisY < win_bottom_left.axisY or position.axisY > win_top_right.axisY:
-                #print(f'Position {position} is outside window')
-                return False
-        
-        return True
-    
-    def clip(self, polygon: WireFrame | Curve, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> WireFrame | Curve | None:
-        # Deepcopy because we change Z coordinate
-        positions = deepcopy(polygon.getPositions())
-        
-        if self.__wireframe_inside(positions, win_bottom_left, win_top_right):
+        return WireFrame(polygon.name, np.concatenate([clipped, np.ones((len(clipped), 1))], axis=1), polygon.filled)
+
+
+class WeilerAthertonNode:
+    """
+    Vertex of the doubly linked lists of the polygon and of the window.
+    Intersections are kept in both lists, each node linked to the same point on the other list
+    """
+    __slots__ = ('axisX', 'axisY', 'next', 'previous', 'partner', 'entering')
+
+    def __init__(self, axisX: float, axisY: float, entering: bool | None = None) -> None:
+        self.axisX = axisX
+        self.axisY = axisY
+        self.next: WeilerAthertonNode = None
+        self.previous: WeilerAthertonNode = None
+        self.partner: WeilerAthertonNode | None = None
+        self.entering = entering
+
+    @staticmethod
+    def link(nodes: list['WeilerAthertonNode']) -> None:
+        """ Links the nodes in a circular list, in the given order """
+        for index, node in enumerate(nodes):
+            node.next = nodes[(index + 1) % len(nodes)]
+            node.next.previous = node
+
+
+class WeilerAthertonStrategy(PolygonClippingStrategy):
+    """
+    Walks the polygon and the window borders, jumping between them at each intersection.
+    The intersections are linked to each other when found, so each jump is O(1) and the clipping is O(n + k log k),
+    with n vertices and k intersections, the log coming from sorting the intersections along the window
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+    @staticmethod
+    def __intersections(vertices: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Liang-Barsky over all edges of the polygon at once, the edge i goes from the vertex i to the vertex i + 1.
+        Returns the entering and leaving parameters of each edge and the border (left, right, bottom, top) crossed by them
+        """
+        start = vertices
+        delta = np.roll(vertices, -1, axis=0) - vertices
+
+        p = np.stack([-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]], axis=1)
+        q = np.stack([start[:, 0] - rectMin[0], rectMax[0] - start[:, 0], start[:, 1] - rectMin[1], rectMax[1] - start[:, 1]], axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = q / p
+
+        # Zero is kept for the start and one for the end, so the parameters without crossing stay in the edge
+        enteringRatios = np.where(p < 0, ratio, -np.inf)
+        leavingRatios = np.where(p > 0, ratio, np.inf)
+
+        enteringBorder = enteringRatios.argmax(axis=1)
+        leavingBorder = leavingRatios.argmin(axis=1)
+
+        tEntering = np.maximum(enteringRatios.max(axis=1), 0)
+        tLeaving = np.minimum(leavingRatios.min(axis=1), 1)
+
+        # Edges parallel to a border and outside of it never cross the window
+        parallelOutside = ((p == 0) & (q < 0)).any(axis=1)
+        crosses = ~parallelOutside & (tEntering <= tLeaving)
+
+        entering = crosses & (tEntering > 0)
+        leaving = crosses & (tLeaving < 1)
+
+        return np.where(entering, tEntering, np.nan), enteringBorder, np.where(leaving, tLeaving, np.nan), leavingBorder
+
+    @staticmethod
+    def __perimeter(axisX: float, axisY: float, border: int, rectMin: np.ndarray, rectMax: np.ndarray) -> float:
+        """ Distance from the bottom left corner walking counterclockwise over the window borders """
+        width, height = rectMax - rectMin
+
+        if border == 2:
+            return axisX - rectMin[0]
+        if border == 1:
+            return width + axisY - rectMin[1]
+        if border == 3:
+            return width + height + rectMax[0] - axisX
+
+        return 2 * width + height + rectMax[1] - axisY
+
+    @staticmethod
+    def __contains(vertices: np.ndarray, point: np.ndarray) -> bool:
+        """ Even-odd test of the point against the polygon """
+        start = vertices
+        end = np.roll(vertices, -1, axis=0)
+
+        crossesY = (start[:, 1] > point[1]) != (end[:, 1] > point[1])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossingX = start[:, 0] + (point[1] - start[:, 1]) * (end[:, 0] - start[:, 0]) / (end[:, 1] - start[:, 1])
+
+        return bool(np.count_nonzero(crossesY & (point[0] < crossingX)) % 2)
+
+    def clip(self, polygon: WireFrame | Curve | RenderProxy, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> WireFrame | Curve | RenderProxy | None:
+        rectMin = np.array([win_bottom_left.axisX, win_bottom_left.axisY], dtype=np.float64)
+        rectMax = np.array([win_top_right.axisX, win_top_right.axisY], dtype=np.float64)
+
+        vertices = polygon.getPositionsArray()[:, :2].astype(np.float64)
+
+        if ((vertices >= rectMin) & (vertices <= rectMax)).all():
             return polygon
-        
-        subject = []
-        cr_i = [[], [], [], []]
-        c_length = len(positions)
-        
-        # Set to 1 to avoid removing at the end
-        for p in positions:
-            p.axisZ = 1
-        
-        counter = 0
-        for i in range(-1, c_length - 1):
-            intersection = self.__intersection_lb(positions[i], positions[i + 1], win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-            #print(f'Intersection: {intersection} for positions: {positions[i]} and {positions[i + 1]}')
-            
-            if intersection:
-                counter += 1
-                subject.append(positions[i])
-                
-                if len(intersection) == 2:
-                    subject.append(intersection)
-                        
-                    x = round(intersection[1].axisX, 5)
-                    y = round(intersection[1].axisY, 5)
-                    
-                    # bottom
-                    if y == win_bottom_left.axisY:
-                        cr_i[0].append(intersection)
-                    # right
-                    if x == win_top_right.axisX:
-                        cr_i[1].append(intersection)
-                    # top
-                    if y == win_top_right.axisY:
-                        cr_i[2].append(intersection)
-                    # left
-                    if x == win_bottom_left.axisX:
-                        cr_i[3].append(intersection)
-                else:
-                    x0 = round(intersection[1].axisX, 5)
-                    y0 = round(intersection[1].axisY, 5)
-                    x1 = round(intersection[3].axisX, 5)
-                    y1 = round(intersection[3].axisY, 5)
-                    
-                    subject.append(intersection[2:])
-
-                    # bottom
-                    if y1 == win_bottom_left.axisY:
-                        cr_i[0].append(intersection[2:])
-                    # right
-                    elif x1 == win_top_right.axisX:
-                        cr_i[1].append(intersection[2:])
-                    # top
-                    elif y1 == win_top_right.axisY:
-                        cr_i[2].append(intersection[2:])
-                    # left
-                    elif x1 == win_bottom_left.axisX:
-                        cr_i[3].append(intersection[2:])
-                        
-                    subject.append(intersection[:2])
-                    
-                    
-                    # bottom
-                    if y0 == win_bottom_left.axisY:
-                        cr_i[0].append(intersection[:2])
-                    # right
-                    elif x0 == win_top_right.axisX:
-                        cr_i[1].append(intersection[:2])
-                    # top
-                    elif y0 == win_top_right.axisY:
-                        cr_i[2].append(intersection[:2])
-                    # left
-                    elif x0 == win_bottom_left.axisX:
-                        cr_i[3].append(intersection[:2])
-
-                    counter += 1
-                        
-            else:
-                subject.append(positions[i])
-                
-        # unpack intersections on
-        cr_i.insert(0, [Position3D(win_bottom_left.axisX, win_bottom_left.axisY, 0)])
-        cr_i.insert(2, [Position3D(win_bottom_right.axisX, win_bottom_right.axisY, 0)])
-        cr_i.insert(4, [Position3D(win_top_right.axisX, win_top_right.axisY, 0)])
-        cr_i.insert(6, [Position3D(win_top_left.axisX, win_top_left.axisY, 0)])
-        
-        #print(cr_i)
-        
-        # sort intersections according to window border
-        cr_i[1].sort(key=lambda x: x[1].axisX if type(x) is list else x.axisX)
-        cr_i[3].sort(key=lambda x: x[1].axisY if type(x) is list else x.axisY)
-        cr_i[5].sort(key=lambda x: x[1].axisX if type(x) is list else x.axisX, reverse=True)
-        cr_i[7].sort(key=lambda x: x[1].axisY if type(x) is list else x.axisY, reverse=True)
-
-        # flatten intersections
-        cr = [j for i in cr_i for j in i]
-        
-        """ for i in range(len(cr)):
-            if type(cr[i]) is list:
-                print((cr[i][1].axisX, cr[i][1].axisY, cr[i][1].axisZ), end=' ')
-            else:
-                print((cr[i].axisX, cr[i].axisY, cr[i].axisZ), end=' ')
-        print() """
 
-        # No intersections, simply return and remove element
-        if counter == 0:
-            return None 
-        
-        # get iteraton index
-        i = None
-        for n in range(len(subject)):
-            #print(f'Subject: {subject[n]}')
-            if type(subject[n]) is list:
-                # mark first intersection index
-                if subject[n][0] == "out-in":
-                    i = n
-                    break
-        # check if subject is oriented clockwise
-        # if subject[n]:
-        # the clipped polygon coordinates
-        clipped = [subject[i][1]]
-        # boolean to check where to iterate
-        on_polygon = True
-        
-        # iterate over polygon and window
-        while True:
-            i += 1
-            if on_polygon:
-                i = i % len(subject)
-                
-                #print('Subject: ', subject[i])
+        # The window is walked counterclockwise, so the polygon must be in the same orientation
+        area = np.sum(vertices[:, 0] * np.roll(vertices[:, 1], -1) - np.roll(vertices[:, 0], -1) * vertices[:, 1])
+        if area < 0:
+            vertices = vertices[::-1]
 
-                if type(subject[i]) is not list:
-                    if self.__wireframe_inside([subject[i]], win_bottom_left, win_top_right):
-                        clipped.append(subject[i])
-                else:
-                    x_subject, y_subject, z_subject = subject[i][1].axisX, subject[i][1].axisY, subject[i][1].axisZ
-                    x_clipped, y_clipped, z_clipped = clipped[0].axisX, clipped[0].axisY, clipped[0].axisZ
-                    
-                    if x_subject == x_clipped and y_subject == y_clipped:
-                        break
-                    on_polygon = False
-                    clipped.append(subject[i][1])
-                    #print(cr)
-                    for n in range(len(cr)):
-                        if type(cr[n]) is list:
-                            if cr[n][1].axisX == x_subject and cr[n][1].axisY == y_subject:
-                                i = n
-                                break
-                                
-            else:
-                i = i % len(cr) 
+        tEntering, enteringBorder, tLeaving, leavingBorder = self.__intersections(vertices, rectMin, rectMax)
+        delta = np.roll(vertices, -1, axis=0) - vertices
 
-                #print('CR: ', cr[i])
-                
-                if type(cr[i]) is not list:
-                    clipped.append(cr[i])
+        subject: list[WeilerAthertonNode] = []
+        # (position over the window border, node) of each intersection
+        borderIntersections: list[tuple[float, WeilerAthertonNode]] = []
+
+        for index, (axisX, axisY) in enumerate(vertices.tolist()):
+            subject.append(WeilerAthertonNode(axisX, axisY))
+
+            for t, border, entering in ((tEntering[index], enteringBorder[index], True), (tLeaving[index], leavingBorder[index], False)):
+                if np.isnan(t):
+                    continue
 
+                intersectionX, intersectionY = (vertices[index] + t * delta[index]).tolist()
+
+                # Places the point exactly over the border crossed
+                if border < 2:
+                    intersectionX = rectMin[0] if border == 0 else rectMax[0]
                 else:
-                    x_cr, y_cr, z_cr = cr[i][1].axisX, cr[i][1].axisY, cr[i][1].axisZ
-                    x_clipped, y_clipped, z_clipped = clipped[0].axisX, clipped[0].axisY, clipped[0].axisZ
-                    
-                    if x_cr == x_clipped and y_cr == y_clipped:
-                        clipped.append(cr[i][1])
-                        break
-                    on_polygon = True
-                    
-                    clipped.append(cr[i][1])
-                    for n in range(len(subject)):
-                        if type(subject[n]) is list:
-                            if subject[n][1].axisX == x_cr and subject[n][1].axisY == y_cr:
-                                i = n
-                                break
-        
-        return WireFrame(polygon.name, [Point.fromPosition(p) for p in clipped], polygon.filled)
-                
-              
+                    intersectionY = rectMin[1] if border == 2 else rectMax[1]
+
+                node = WeilerAthertonNode(intersectionX, intersectionY, entering)
+                node.partner = WeilerAthertonNode(intersectionX, intersectionY, entering)
+                node.partner.partner = node
+
+                subject.append(node)
+                borderIntersections.append((self.__perimeter(intersectionX, intersectionY, border, rectMin, rectMax), node.partner))
+
+        if len(borderIntersections) == 0:
+            # The polygon either surrounds the window or is completely outside of it
+            if self.__contains(vertices, (rectMin + rectMax) / 2):
+                corners = [win_bottom_left, win_bottom_right, win_top_right, win_top_left]
+                return WireFrame(polygon.name, np.array([[c.axisX, c.axisY, 1] for c in corners], dtype=np.float64), polygon.filled)
+
+            return None
+
+        width, height = rectMax - rectMin
+        corners = [
+            (0, WeilerAthertonNode(rectMin[0], rectMin[1])),
+            (width, WeilerAthertonNode(rectMax[0], rectMin[1])),
+            (width + height, WeilerAthertonNode(rectMax[0], rectMax[1])),
+            (2 * width + height, WeilerAthertonNode(rectMin[0], rectMax[1])),
+        ]
+
+        # Stable sort, the corners stay before the intersections over them
+        window = [node for _, node in sorted(corners + borderIntersections, key=lambda item: item[0])]
+
+        WeilerAthertonNode.link(subject)
+        WeilerAthertonNode.link(window)
+
+        start = next(node for node in subject if node.entering)
+        clipped: list[tuple[float, float]] = []
+
+        node = start
+        # Each node is visited at most once in a well formed walk
+        remainingSteps = len(subject) + len(window)
+
+        while remainingSteps > 0:
+            # Inside the window, follow the polygon from the entering intersection until it leaves
+            clipped.append((node.axisX, node.axisY))
+            node = node.next
+
+            while node.partner is None and remainingSteps > 0:
+                clipped.append((node.axisX, node.axisY))
+                node = node.next
+                remainingSteps -= 1
+
+            # Then follow the window borders until the polygon comes back
+            clipped.append((node.axisX, node.axisY))
+            node = node.partner.next
+
+            while node.partner is None and remainingSteps > 0:
+                clipped.append((node.axisX, node.axisY))
+                node = node.next
+                remainingSteps -= 1
+
+            node = node.partner
+            remainingSteps -= 1
+
+            if node is start:
+                break
+
+        positions = np.ones((len(clipped), 3), dtype=np.float64)
+        positions[:, :2] = clipped
+
+        return WireFrame(polygon.name, positions, polygon.filled)
+
+
+class ViewVolumeClipper:
+    """
+    Clipping against the planes of the view volume, over homogeneous coordinates and before the divide.
+    Each plane is a (4,) vector, a vertex v is inside it when v . plane >= 0
+    """
+    @staticmethod
+    def clipSegments(segments: np.ndarray, planes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Clips a (M, 2, 4) batch of homogeneous segments against all planes at once.
+        Returns the (M, 2, 4) clipped segments and the (M,) mask of the segments that are kept
+        """
+        start = segments[:, 0]
+        end = segments[:, 1]
+
+        startDistances = start @ planes.T
+        endDistances = end @ planes.T
+
+        outside = ((startDistances < 0) & (endDistances < 0)).any(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = startDistances / (startDistances - endDistances)
+
+            # The segment enters the planes where the start is outside and leaves them where the end is outside
+            tEntering = np.where(startDistances < 0, t, 0).max(axis=1)
+            tLeaving = np.where(endDistances < 0, t, 1).min(axis=1)
+
+            keep = ~outside & (tEntering <= tLeaving)
+
+        delta = end - start
+        clipped = np.stack([start + tEntering[:, None] * delta, start + tLeaving[:, None] * delta], axis=1)
+
+        return clipped, keep
+
+    @staticmethod
+    def clipPolygon(vertices: np.ndarray, planes: np.ndarray) -> np.ndarray:
+        """ Sutherland-Hodgman of the (N, 4) homogeneous vertices of a closed polygon, one plane per pass """
+        for plane in planes:
+            if len(vertices) == 0:
+                break
+
+            following = np.roll(vertices, -1, axis=0)
+
+            distances = vertices @ plane
+            followingDistances = np.roll(distances, -1)
+
+            inside = distances >= 0
+            crossing = inside != (followingDistances >= 0)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = distances / (distances - followingDistances)
+                intersection = vertices + t[:, None] * (following - vertices)
+
+            candidates = np.stack([vertices, intersection], axis=1)
+            vertices = candidates[np.stack([inside, crossing], axis=1)]
+
+        return vertices
+
+
 class Clipper:
     def __init__(self) -> None:
         self.__lineClippingStrategy: LineClippingStrategy = CohenSutherlandStrategy()
-        self.__polygongClip = WeilerAthertonStrategy()
+        self.__polygonClippingStrategy: PolygonClippingStrategy = WeilerAthertonStrategy()
     
-    def __clipWireframe3D(self, wireframe: WireFrame, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> WireFrame:
-        positions = deepcopy(wireframe.getPositions())
-        faces = deepcopy(wireframe.faces)
-        
-        clipped_faces = []
-        clipped_positions = []
-        lines: List[Line] = []
-        
-        for face in faces:
-            clipped_face = []
-            
-            for i in range(-1, len(face) - 1):
-                p1 = Point.fromPosition(positions[face[i] - 1])
-                p2 = Point.fromPosition(positions[face[i + 1] - 1])
-                
-                line = LiangBarskyStrategy().clip(Line(p1, p2, wireframe.name), win_bottom_left, win_top_left, win_top_right, win_bottom_right)
+    @staticmethod
+    def isPolygon(obj: SGIObject | RenderProxy) -> bool:
+        """ 2D wireframes are clipped as polygons, unless they only have two points """
+        return obj.type == ObjectsTypes.WIREFRAME and not obj.is3D() and len(obj.getPositionsArray()) != 2
 
-                if line is None:
-                    continue
+    @staticmethod
+    def segmentIndices(source: SGIObject | RenderProxy, count: int) -> np.ndarray:
+        """ (M, 2) indices of the segments drawn for an object with count vertices """
+        if source.type == ObjectsTypes.WIREFRAME and source.is3D():
+            return source.edgeIndices
 
-                lines.append(line)
-                
-                clipped_positions.append(line.getPositions()[0])
-                clipped_positions.append(line.getPositions()[1])
-                
-                clipped_face.append(len(clipped_positions) - 1)
-                clipped_face.append(len(clipped_positions))
-                
-            if len(clipped_face) > 0:
-                clipped_faces.append(clipped_face)
-        
-        if len(clipped_positions) == 0:
+        elif source.type == ObjectsTypes.CURVE:
+            return np.stack([np.arange(count - 1), np.arange(1, count)], axis=1).reshape(-1, 2)
+
+        elif source.type == ObjectsTypes.SURFACE:
+            edges = getattr(source, 'edgeIndices', None)
+
+            # Without the edges of the tessellation the positions are taken as a square grid
+            if edges is None:
+                size = int(count ** 0.5)
+                return Surface.gridEdges(size, size)
+
+            return edges
+
+        # Lines
+        return np.array([[0, 1]])
+
+    def __segmentsOf(self, obj: RenderProxy) -> np.ndarray:
+        """ (M, 2, 2) segments drawn for the object """
+        # Objects clipped against the view volume already come as segments
+        if obj.lines is not None:
+            return obj.lines[:, :, :2]
+
+        positions = obj.getPositionsArray()[:, :2]
+
+        return positions[self.segmentIndices(obj, len(positions))]
+
+    def __fromSegments(self, obj: RenderProxy, segments: np.ndarray) -> RenderProxy | None:
+        """ Proxy with the segments that passed the clipping """
+        if len(segments) == 0:
             return None
 
-        return WireFrame(wireframe.name, [Point.fromPosition(p) for p in clipped_positions], wireframe.filled, clipped_faces, lines)
-    
-    def __clipPoint(self, point: Point, win_bottom_left: Position3D, win_top_left: Position3D, win_top_right: Position3D, win_bottom_right: Position3D) -> Point | None:
-        if point.position.axisX >= win_bottom_left.axisX and point.position.axisX <= win_top_right.axisX and point.position.axisY >= win_bottom_left.axisY and point.position.axisY <= win_top_right.axisY:
-            return point
-        
-        return None
+        segments = np.concatenate([segments, np.zeros((len(segments), 2, 1))], axis=2)
+
+        # The projected vertices are kept, only the lines are drawn
+        if obj.type == ObjectsTypes.WIREFRAME and obj.is3D():
+            return obj.withLines(segments)
+
+        # Lines and curves are drawn from the positions, the segments of the view volume clipping are dropped
+        elif obj.type == ObjectsTypes.CURVE:
+            return obj.withLines(None).withPositions(segments.reshape(-1, 3))
+
+        # Stores the lines within the proxy to be used by the painter
+        elif obj.type == ObjectsTypes.SURFACE:
+            return obj.withLines(segments)
+
+        return obj.withLines(None).withPositions(segments[0])
     
+    def __unclipped(self, obj: RenderProxy) -> RenderProxy:
+        """ Proxy of an object completely inside the window, only the lines used by the painter are added """
+        if (obj.type == ObjectsTypes.WIREFRAME and obj.is3D()) or obj.type == ObjectsTypes.SURFACE:
+            segments = self.__segmentsOf(obj)
+
+            return obj.withLines(np.concatenate([segments, np.zeros((len(segments), 2, 1))], axis=2))
+
+        return obj
+
     def setLineClippingStrategy(self, strategy: LineClippingStrategy) -> None:
         self.__lineClippingStrategy = strategy
+
+    def setPolygonClippingStrategy(self, strategy: PolygonClippingStrategy) -> None:
+        self.__polygonClippingStrategy = strategy
         
-    def clip(self, window_v_up: list[Position3D], objs: list[SGIObject], length: int) -> list[SGIObject]:
+    def clip(self, window_v_up: list[Position3D], objs: list[RenderProxy], length: int) -> list[RenderProxy]:
+        """
+        Clips the render proxies against the window, returning new proxies with the clipped positions and lines.
+        Objects completely inside or outside of the window are resolved by their bounding boxes, the segments of the
+        remaining lines, curves, surfaces and 3D wireframes go to the line clipping strategy in a single batch
+        """
         win_bottom_left = window_v_up[0]
         win_top_left = window_v_up[1]
         win_top_right = window_v_up[2]
         win_bottom_right = window_v_up[3]
+
+        rectMin = np.array([win_bottom_left.axisX, win_bottom_left.axisY], dtype=np.float64)
+        rectMax = np.array([win_top_right.axisX, win_top_right.axisY], dtype=np.float64)
         
-        clipped_objs = []
-        
-        for obj in objs:
-            temp = None
-            
-            if obj.type == ObjectsTypes.POINT:
-                temp = self.__clipPoint(obj, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
+        clipped: dict[int, RenderProxy | None] = {}
 
-            elif obj.type == ObjectsTypes.LINE or (obj.type == ObjectsTypes.WIREFRAME and len(obj.getPositions()) == 2):
-                temp = self.__lineClippingStrategy.clip(obj, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
+        segmentObjects: List[tuple[int, RenderProxy]] = []
+        segments: List[np.ndarray] = []
 
-            elif obj.type == ObjectsTypes.WIREFRAME:
-                if not obj.is3D():
-                    temp = self.__polygongClip.clip(obj, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-                else:
-                    temp = self.__clipWireframe3D(obj, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-                
-            elif obj.type == ObjectsTypes.CURVE:
-                curvePoints = []
-                
-                for i in range(0, len(obj.getPositions()) - 1):
-                    temp = self.__lineClippingStrategy.clip(Line(Point.fromPosition(obj.getPositions()[i]), Point.fromPosition(obj.getPositions()[i + 1]), obj.name), win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-                    
-                    if temp is None:
-                        continue
-                    
-                    curvePoints.append(Point.fromPosition(temp.getPositions()[0]))
-                    curvePoints.append(Point.fromPosition(temp.getPositions()[1]))
-                
-                if len(curvePoints) > 0:
-                    temp = Curve(obj.name, curvePoints, obj.strategy)
+        # Trivial accept and reject with the bounding boxes of all objects at once
+        bounds = np.array([obj.bounds[:, :2] for obj in objs]).reshape(-1, 2, 2)
 
-            # Read the points of the surface and determine the lines that will be created, then create the lines and clip then
-            # Stores the lines within the object to be used by the painter
-            elif obj.type == ObjectsTypes.SURFACE:
-                positions: List[Position3D] = obj.getPositions()
-                
-                objCopy: Surface = obj
-                lines: List[Line] = []                
-
-                surfaceSquareSize = int(len(positions) ** 0.5)  # Assuming positions form a perfect square grid of size N x N
-                for i in range(surfaceSquareSize):
-                    for j in range(surfaceSquareSize):
-                        index = i * surfaceSquareSize + j
-                        print(index, end=' ')
-                        current = positions[index]
-                        
-                        # Draw line to the right neighbor
-                        if j < surfaceSquareSize - 1:
-                            print('R', end='')
-                            right_neighbor = positions[index + 1]
-                            # Create a line
-                            line = Line(Point.fromPosition(current), Point.fromPosition(right_neighbor), obj.name)
-                            # Clip it
-                            line = self.__lineClippingStrategy.clip(line, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-                            # Store
-                            if line is not None:
-                                lines.append(line)
-                        
-                        # Draw line to the bottom neighbor
-                        if i < surfaceSquareSize - 1:
-                            print('B', end='')
-                            bottom_neighbor = positions[index + surfaceSquareSize]
-                            # Create a line
-                            line = Line(Point.fromPosition(current), Point.fromPosition(bottom_neighbor), obj.name)
-                            # Clip it
-                            line = self.__lineClippingStrategy.clip(line, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
-                            # Store
-                            if line is not None:
-                                lines.append(line)
-
-                objCopy.setLinesToDraw(lines)
-                temp = objCopy
-                # If no line passed the clip, then removes the Surface
-                if len(lines) == 0:
-                    temp = None
-                
-            if temp is not None:
-                temp.setColor(obj.color)
-                clipped_objs.append(temp)
+        with np.errstate(invalid='ignore'):
+            outside = ~((bounds[:, 1] >= rectMin) & (bounds[:, 0] <= rectMax)).all(axis=1)
+            inside = ((bounds[:, 0] >= rectMin) & (bounds[:, 1] <= rectMax)).all(axis=1)
+
+        for index, obj in enumerate(objs):
+            if outside[index]:
+                clipped[index] = None
+
+            elif inside[index]:
+                clipped[index] = self.__unclipped(obj)
+
+            # Points are always accepted or rejected by their bounding box
+            elif self.isPolygon(obj):
+                temp = self.__polygonClippingStrategy.clip(obj, win_bottom_left, win_top_left, win_top_right, win_bottom_right)
+
+                # The strategies create new shapes, only their positions are kept
+                if temp is not None and not isinstance(temp, RenderProxy):
+                    temp = obj.withPositions(temp.getPositionsArray())
+
+                clipped[index] = temp
+
+            else:
+                segmentObjects.append((index, obj))
+                segments.append(self.__segmentsOf(obj))
+
+        if len(segments) > 0:
+            offsets = np.cumsum([0] + [len(objSegments) for objSegments in segments])
+
+            clippedSegments, keep = self.__lineClippingStrategy.clipSegments(np.concatenate(segments), rectMin, rectMax)
+
+            for (index, obj), start, end in zip(segmentObjects, offsets[:-1], offsets[1:]):
+                clipped[index] = self.__fromSegments(obj, clippedSegments[start:end][keep[start:end]])
         
-        return clipped_objs
\ No newline at end of file
+        return [clipped[index] for index in range(len(objs)) if clipped[index] is not None]
@@ -1,190 +1,204 @@
-from enum import Enum
-from Domain.Utils.Coordinates import Position3D
 from Domain.Shapes.Curve import Curve
 from Domain.Utils.Enums import CurvePlottingMethods
+from Domain.Utils.Splines import Splines
 from abc import ABC, abstractmethod
-from typing import List
 import numpy as np
 
 class CurvesPlottingStrategy(ABC):
     def __init__(self) -> None:
         pass
+
+    @staticmethod
+    def evaluateSegments(basisMatrix: np.ndarray, geometry: np.ndarray, precision: float) -> np.ndarray:
+        """
+        Evaluates the (K, 4, 3) geometry of K segments at all samples at once, returns the (K, S, 3) points of each segment
+        """
+        coefficients = basisMatrix @ geometry
+
+        return Splines.powerBasis(precision) @ coefficients
     
+    @staticmethod
+    def flatness(segments: np.ndarray) -> np.ndarray:
+        """ (K,) largest distance of the inner control points of the (K, 4, 3) Bezier segments to their chords """
+        chord = segments[:, 3] - segments[:, 0]
+        chordLength = np.linalg.norm(chord, axis=1)
+
+        inner = segments[:, 1:3] - segments[:, None, 0]
+        distances = np.linalg.norm(np.cross(inner, chord[:, None]), axis=2) / np.maximum(chordLength, 1e-12)[:, None]
+
+        # Degenerate chords, the distance to the first point is used
+        distances = np.where(chordLength[:, None] > 1e-12, distances, np.linalg.norm(inner, axis=2))
+
+        return distances.max(axis=1)
+
+    @staticmethod
+    def subdivideAdaptive(segments: np.ndarray, tolerance: float, maxDepth: int = 16) -> np.ndarray:
+        """
+        Splits the (K, 4, 3) Bezier segments in halves with de Casteljau until each piece is flat within the tolerance.
+        All pieces of the same depth are split at once, returns the (N, 3) points of the polyline in order
+        """
+        if len(segments) == 0:
+            return np.empty((0, 3))
+
+        # Segment and parameter where each piece starts, to put the pieces back in order
+        segmentIndex = np.arange(len(segments))
+        start = np.zeros(len(segments))
+        width = 1.0
+
+        finished: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+        for depth in range(maxDepth + 1):
+            flat = CurvesPlottingStrategy.flatness(segments) <= tolerance
+
+            if depth == maxDepth:
+                flat[:] = True
+
+            finished.append((segments[flat], segmentIndex[flat], start[flat]))
+
+            segments, segmentIndex, start = segments[~flat], segmentIndex[~flat], start[~flat]
+
+            if len(segments) == 0:
+                break
+
+            p0, p1, p2, p3 = segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3]
+            p01, p12, p23 = (p0 + p1) / 2, (p1 + p2) / 2, (p2 + p3) / 2
+            p012, p123 = (p01 + p12) / 2, (p12 + p23) / 2
+            middle = (p012 + p123) / 2
+
+            width /= 2
+            segments = np.concatenate([np.stack([p0, p01, p012, middle], axis=1), np.stack([middle, p123, p23, p3], axis=1)])
+            segmentIndex = np.concatenate([segmentIndex, segmentIndex])
+            start = np.concatenate([start, start + width])
+
+        pieces = np.concatenate([pieceSegments for pieceSegments, _, _ in finished])
+        order = np.lexsort((np.concatenate([pieceStart for _, _, pieceStart in finished]), np.concatenate([index for _, index, _ in finished])))
+
+        # The start of every piece, then the end of the last one closes the polyline
+        pieces = pieces[order]
+
+        return np.concatenate([pieces[:, 0], pieces[-1:, 3]])
+
+    def bezierSegments(self, curve: Curve) -> np.ndarray:
+        """ (K, 4, 3) control points of the curve written as cubic Bezier segments, by a change of basis """
+        return Splines.toBezierMatrix(self.basisMatrix) @ self.geometry(curve)
+
+    def affectedSegments(self, controlPoints: np.ndarray, controlPointCount: int) -> np.ndarray:
+        """ Sorted indices of the segments that depend on any of the control points """
+        return np.arange(self.segmentCount(controlPointCount))
+
+    def generatePoints(self, curve: Curve, precision: float) -> np.ndarray:
+        """
+        Points of the curve, kept by the curve as one buffer per segment. After moveControlPoint only the segments
+        that depend on the moved points are evaluated again, the others are reused as they are.
+
+        The result is a read only view of that buffer, nothing is copied, so it is only valid until the next edit
+        """
+        points = curve.segmentPoints(precision)
+        edited = curve.takeEditedControlPoints()
+
+        if points is None:
+            points = self.evaluateSegments(self.basisMatrix, self.geometry(curve), precision)
+            curve.setSegmentPoints(precision, points)
+
+        elif len(edited) > 0:
+            segments = self.affectedSegments(edited, len(curve.getPositionsArray()))
+            points[segments] = self.evaluateSegments(self.basisMatrix, self.geometry(curve, segments), precision)
+
+        view = points.reshape(-1, 3)
+        view.setflags(write=False)
+
+        return view
+
+    def generateAdaptivePoints(self, curve: Curve, tolerance: float) -> np.ndarray:
+        """
+        Points of the curve with the segments subdivided until they are flat within the tolerance,
+        so the number of points follows the size of the curve instead of a fixed step
+        """
+        return self.subdivideAdaptive(self.bezierSegments(curve), tolerance)
+
+    @property
     @abstractmethod
-    def generatePoints(self, curve: Curve, precision: float) -> List[Position3D]:
+    def basisMatrix(self) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def segmentCount(self, controlPointCount: int) -> int:
+        pass
+
+    @abstractmethod
+    def geometry(self, curve: Curve, segments: np.ndarray = None) -> np.ndarray:
+        """ (K, 4, 3) geometry of the segments, all of them when none are given """
         pass
 
 class HermiteCurvePlotting(CurvesPlottingStrategy):
     def __init__(self) -> None:
         super().__init__()
 
-    def generatePoints(self, curve: Curve, precision: float) -> List[Position3D]:
-        if precision < 0:
-            precision = 0.01
-        elif precision > 1:
-            precision = 1
+    @property
+    def basisMatrix(self) -> np.ndarray:
+        return Splines.HERMITE_MATRIX
 
-        objPositions = curve.getPositions()
-        p1 = objPositions[0]
-        p4 = objPositions[1]
-        r1 = objPositions[2]
-        r4 = objPositions[3]
+    def segmentCount(self, controlPointCount: int) -> int:
+        return 1 if controlPointCount >= 4 else 0
 
-        positionsToPlot: List[Position3D] = []
-        t = 0
-        while t <= 1:
-            componentXOne = p1.axisX * ((2 * t**3) - (3 * t**2) + 1) 
-            componentXTwo = p4.axisX * (-(2 * t**3) + (3 * t**2)) 
-            componentXThree = r1.axisX * ((t**3) - (2 * t**2) + t) 
-            componentXFour = r4.axisX * ((t**3) - (t**2))
+    def geometry(self, curve: Curve, segments: np.ndarray = None) -> np.ndarray:
+        # The positions are p1, p4, r1 and r4
+        return curve.getPositionsArray()[:4].reshape(1, 4, 3)
 
-            positionX = componentXOne + componentXTwo + componentXThree + componentXFour
+class BezierCurvePlotting(CurvesPlottingStrategy):
+    def __init__(self) -> None:
+        super().__init__()
 
-            componentYOne = p1.axisX * ((2 * t**3) - (3 * t**2) + 1) 
-            componentYTwo = p4.axisX * (-(2 * t**3) + (3 * t**2)) 
-            componentYThree = r1.axisX * ((t**3) - (2 * t**2) + t) 
-            componentYFour = r4.axisX * ((t**3) - (t**2))
+    @property
+    def basisMatrix(self) -> np.ndarray:
+        return Splines.BEZIER_MATRIX
 
-            positionY = componentYOne + componentYTwo + componentYThree + componentYFour
+    def segmentCount(self, controlPointCount: int) -> int:
+        return max((controlPointCount - 1) // 3, 0)
 
-            positionsToPlot.append(Position3D(positionX, positionY, 1))
+    def affectedSegments(self, controlPoints: np.ndarray, controlPointCount: int) -> np.ndarray:
+        # The point 3k is shared by the segments k - 1 and k, the points 3k + 1 and 3k + 2 only belong to the segment k
+        segments = np.concatenate([(controlPoints - 1) // 3, controlPoints // 3])
 
-            t += precision
+        return np.unique(segments[(segments >= 0) & (segments < self.segmentCount(controlPointCount))])
 
-        return positionsToPlot
+    def geometry(self, curve: Curve, segments: np.ndarray = None) -> np.ndarray:
+        positions = curve.getPositionsArray()
 
-class BezierCurvePlotting(CurvesPlottingStrategy):
-    def __init__(self) -> None:
-        super().__init__()
+        if segments is None:
+            segments = np.arange(self.segmentCount(len(positions)))
 
-    def __bezierMatrix(self) -> np.ndarray:
-        return np.array([
-            [-1, 3, -3, 1],
-            [3, -6, 3, 0],
-            [-3, 3, 0, 0],
-            [1, 0, 0, 0]
-        ])
+        # Segments share their last control point with the next one: 0-3, 3-6, 6-9...
+        return positions[3 * segments[:, None] + np.arange(4)].reshape(-1, 4, 3)
     
-    def generatePoints(self, curve: Curve, precision: float) -> List[Position3D]:
-        if precision < 0:
-            precision = 0.01
-        elif precision > 1:
-            precision = 1
-        
-        positionsToPlot: List[Position3D] = []
-
-        objPositions = curve.getPositions()
-        
-        i = 0
-        while i + 3 < len(objPositions):
-        
-            p1 = objPositions[i]
-            p2 = objPositions[i + 1]
-            p3 = objPositions[i + 2]
-            p4 = objPositions[i + 3]
-            
-            t = 0
-            
-            mat_x = np.array([p1.axisX, p2.axisX, p3.axisX, p4.axisX])
-            mat_y = np.array([p1.axisY, p2.axisY, p3.axisY, p4.axisY])
-            
-            aux_mat_x = np.matmul(self.__bezierMatrix(), mat_x)
-            aux_mat_y = np.matmul(self.__bezierMatrix(), mat_y)
-            
-            while t <= 1:
-                t_mat = np.array([t**3, t**2, t, 1])
-                
-                positionX = np.matmul(t_mat, aux_mat_x)
-                positionY = np.matmul(t_mat, aux_mat_y)
-
-                positionsToPlot.append(Position3D(positionX, positionY, 1))
-
-                t += precision
-                
-            i += 3
-
-        return positionsToPlot
+    def bezierSegments(self, curve: Curve) -> np.ndarray:
+        return self.geometry(curve)
  
 class BSplineCurvePlotting(CurvesPlottingStrategy):
     def __init__(self) -> None:
         super().__init__() 
+
+    @property
+    def basisMatrix(self) -> np.ndarray:
+        return Splines.BSPLINE_MATRIX
+
+    def segmentCount(self, controlPointCount: int) -> int:
+        return max(controlPointCount - 3, 0)
+
+    def affectedSegments(self, controlPoints: np.ndarray, controlPointCount: int) -> np.ndarray:
+        # The point i is in the windows that start from i - 3 to i
+        segments = (controlPoints[:, None] - np.arange(4)).reshape(-1)
+
+        return np.unique(segments[(segments >= 0) & (segments < self.segmentCount(controlPointCount))])
     
-    def __BSplineMatrix(self):
-        return np.array([
-                [-1 / 6, 1 / 2, -1 / 2, 1 / 6],
-                [1 / 2, -1, 1 / 2, 0],
-                [-1 / 2, 0, 1 / 2, 0],
-                [1 / 6, 2 / 3, 1 / 6, 0],
-            ])
-    
-    def __computeParams(self, positions: List[Position3D], t: float) -> tuple[float, float]:
-        def calcDiffInit(delta: float, a: float, b: float, c: float, d: float) -> float:
-            delta_2 = delta**2
-            delta_3 = delta**3
-            return [
-                d,
-                a * delta_3 + b * delta_2 + c * delta,
-                6 * a * delta_3 + 2 * b * delta_2,
-                6 * a * delta_3,
-            ]
-        
-        GBS_x = []
-        GBS_y = []
-        
-        MBS = self.__BSplineMatrix()
-        
-        for pos in positions:
-            GBS_x.append(pos.axisX)
-            GBS_y.append(pos.axisY)
-            
-        GBS_x = np.array([GBS_x]).T
-        c_x = MBS.dot(GBS_x).T[0]
-        print(c_x)
-        diff_init_x = calcDiffInit(t, *c_x)
-        
-        GBS_y = np.array([GBS_y]).T
-        c_y = MBS.dot(GBS_y).T[0]
-        diff_init_y = calcDiffInit(t, *c_y)
-        
-        return diff_init_x, diff_init_y
-    
-    def generatePoints(self, curve: Curve, precision: float) -> List[Position3D]:
-        positionsToPlot: List[Position3D] = []
-        
-        min_points = 4
-        t = 0
-        
-        length = len(curve.getPositions())
-        
-        for i in range(length):
-            upper_bound = i + min_points
-            
-            if upper_bound > length:
-                break
-            
-            tmp = curve.getPositions()[i:upper_bound]
-            
-            delta_x, delta_y = self.__computeParams(tmp, precision)
-            
-            x = delta_x[0]
-            y = delta_y[0]
-            
-            positionsToPlot.append(Position3D(x, y, 1))
-            
-            while t <= 1:
-                x += delta_x[1]
-                delta_x[1] += delta_x[2]
-                delta_x[2] += delta_x[3]
-
-                y += delta_y[1]
-                delta_y[1] += delta_y[2]
-                delta_y[2] += delta_y[3]
-                
-                positionsToPlot.append(Position3D(x, y, 1))
-                
-                t += precision
-                
-        return positionsToPlot
+    def geometry(self, curve: Curve, segments: np.ndarray = None) -> np.ndarray:
+        positions = curve.getPositionsArray()
+
+        if segments is None:
+            segments = np.arange(self.segmentCount(len(positions)))
+
+        # One segment for each window of 4 consecutive control points, each one sampled over the whole [0, 1]
+        return positions[segments[:, None] + np.arange(4)].reshape(-1, 4, 3)
         
     
 class CurvesPlotter:
@@ -196,5 +210,11 @@ class CurvesPlotter:
             return BSplineCurvePlotting()
 
     @staticmethod
-    def generatePoints(curve: Curve, precision: float) -> List[Position3D]:
-        return CurvesPlotter.buildStrategy(curve.strategy).generatePoints(curve, precision)
\ No newline at end of file
+    def generatePoints(curve: Curve, precision: float) -> np.ndarray:
+        """ (N, 3) points of the curve """
+        return CurvesPlotter.buildStrategy(curve.strategy).generatePoints(curve, precision)
+
+    @staticmethod
+    def generateAdaptivePoints(curve: Curve, tolerance: float) -> np.ndarray:
+        """ (N, 3) points of the curve, subdivided until flat within the tolerance, in world units """
+        return CurvesPlotter.buildStrategy(curve.strategy).generateAdaptivePoints(curve, tolerance)
\ No newline at end of file
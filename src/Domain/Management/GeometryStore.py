@@ -0,0 +1,170 @@
+from typing import Callable
+import numpy as np
+
+
+class GeometryStore:
+    """
+    Structure of arrays with the geometry of every object in the world: one contiguous float64 (N, 3)
+    vertex buffer plus the offset, count and topology of each object, indexed by slot.
+
+    The vertices returned by getVertices are views over the buffer, they are only valid until the next
+    allocation, so the objects always ask the store again instead of keeping them.
+
+    The onChange callback is called with the object id every time the vertices of an object are replaced,
+    and also with the previous and the new position when a single vertex is moved.
+    """
+    __INITIAL_VERTICES: int = 1024
+    __INITIAL_SLOTS: int = 64
+
+    def __init__(self, onChange: Callable[..., None] = None) -> None:
+        self.__onChange = onChange
+
+        self.__vertices = np.zeros((self.__INITIAL_VERTICES, 3), dtype=np.float64)
+        self.__used = 0
+        self.__garbage = 0
+
+        self.__offsets = np.zeros(self.__INITIAL_SLOTS, dtype=np.int64)
+        self.__counts = np.zeros(self.__INITIAL_SLOTS, dtype=np.int64)
+        self.__topology: list[np.ndarray | None] = [None] * self.__INITIAL_SLOTS
+
+        # Object id -> slot
+        self.__slots: dict[int, int] = {}
+        self.__freeSlots: list[int] = []
+        self.__nextSlot = 0
+
+    def __contains__(self, objectId: int) -> bool:
+        return objectId in self.__slots
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """
+        The used part of the vertex buffer, including the space left by resized or released objects
+        """
+        return self.__vertices[:self.__used]
+
+    @property
+    def vertexCount(self) -> int:
+        return self.__used - self.__garbage
+
+    def offset(self, objectId: int) -> int:
+        return int(self.__offsets[self.__slots[objectId]])
+
+    def count(self, objectId: int) -> int:
+        return int(self.__counts[self.__slots[objectId]])
+
+    def allocate(self, objectId: int, vertices: np.ndarray, topology: np.ndarray | None = None) -> None:
+        if objectId in self.__slots:
+            raise ValueError(f"Object {objectId} is already in the geometry store")
+
+        slot = self.__freeSlots.pop() if len(self.__freeSlots) > 0 else self.__newSlot()
+
+        # Empty until the vertices are placed, a compaction while appending must not copy anything for it
+        self.__slots[objectId] = slot
+        self.__counts[slot] = 0
+        self.__topology[slot] = topology
+        self.__append(slot, np.asarray(vertices, dtype=np.float64).reshape(-1, 3))
+
+    def release(self, objectId: int) -> None:
+        slot = self.__slots.pop(objectId)
+
+        self.__garbage += int(self.__counts[slot])
+        self.__counts[slot] = 0
+        self.__topology[slot] = None
+        self.__freeSlots.append(slot)
+
+    def getVertices(self, objectId: int) -> np.ndarray:
+        slot = self.__slots[objectId]
+        offset = self.__offsets[slot]
+
+        return self.__vertices[offset:offset + self.__counts[slot]]
+
+    def setVertices(self, objectId: int, vertices: np.ndarray) -> None:
+        slot = self.__slots[objectId]
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+
+        # Same amount of vertices, overwrite in place
+        if len(vertices) == self.__counts[slot]:
+            offset = self.__offsets[slot]
+            self.__vertices[offset:offset + len(vertices)] = vertices
+
+        # Otherwise the old region becomes garbage and the vertices go to the end of the buffer
+        else:
+            self.__garbage += int(self.__counts[slot])
+            self.__counts[slot] = 0
+            self.__append(slot, vertices)
+
+        if self.__onChange is not None:
+            self.__onChange(objectId)
+
+    def setVertex(self, objectId: int, index: int, vertex: np.ndarray) -> None:
+        """ Overwrites a single vertex of the object in place """
+        slot = self.__slots[objectId]
+
+        if not 0 <= index < self.__counts[slot]:
+            raise IndexError(f"Object {objectId} has no vertex {index}")
+
+        position = self.__offsets[slot] + index
+        previous = self.__vertices[position].copy()
+        self.__vertices[position] = vertex
+
+        if self.__onChange is not None:
+            self.__onChange(objectId, previous, self.__vertices[position].copy())
+
+    def getTopology(self, objectId: int) -> np.ndarray | None:
+        return self.__topology[self.__slots[objectId]]
+
+    def setTopology(self, objectId: int, topology: np.ndarray | None) -> None:
+        self.__topology[self.__slots[objectId]] = topology
+
+    def __newSlot(self) -> int:
+        slot = self.__nextSlot
+        self.__nextSlot += 1
+
+        if slot >= len(self.__offsets):
+            capacity = 2 * len(self.__offsets)
+            # Zeros, np.resize would repeat the offsets and counts of the first slots
+            self.__offsets = np.concatenate([self.__offsets, np.zeros(capacity - len(self.__offsets), dtype=np.int64)])
+            self.__counts = np.concatenate([self.__counts, np.zeros(capacity - len(self.__counts), dtype=np.int64)])
+            self.__topology.extend([None] * (capacity - len(self.__topology)))
+
+        return slot
+
+    def __append(self, slot: int, vertices: np.ndarray) -> None:
+        count = len(vertices)
+
+        if self.__used + count > len(self.__vertices):
+            self.__compact(count)
+
+        self.__vertices[self.__used:self.__used + count] = vertices
+        self.__offsets[slot] = self.__used
+        self.__counts[slot] = count
+        self.__used += count
+
+    def __compact(self, extra: int) -> None:
+        """
+        Moves the live vertices to a new buffer, in the same order, dropping the garbage
+        and keeping at least half of the buffer free after the pending append
+        """
+        live = self.vertexCount
+        capacity = len(self.__vertices)
+
+        while capacity < 2 * (live + extra):
+            capacity *= 2
+
+        buffer = np.zeros((capacity, 3), dtype=np.float64)
+
+        cursor = 0
+        for slot in sorted(self.__slots.values(), key=lambda s: self.__offsets[s]):
+            offset = self.__offsets[slot]
+            count = self.__counts[slot]
+
+            buffer[cursor:cursor + count] = self.__vertices[offset:offset + count]
+            self.__offsets[slot] = cursor
+            cursor += count
+
+        self.__vertices = buffer
+        self.__used = cursor
+        self.__garbage = 0
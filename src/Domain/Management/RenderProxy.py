@@ -0,0 +1,107 @@
+from typing import List
+from Domain.Shapes.SGIObject import SGIObject
+from Domain.Utils.Coordinates import Position3D
+from Domain.Utils.Enums import ObjectsTypes
+import numpy as np
+
+
+class RenderProxy:
+    """
+    What the render pipeline knows about an object during one frame: the source object plus its positions
+    and the segments to draw, already transformed by the stages run so far.
+
+    The proxies are copy-on-write, each stage creates a new proxy with its own arrays and never changes
+    the arrays it received, so the domain objects are never cloned while rendering
+    """
+    def __init__(self, source: SGIObject, positions: np.ndarray | None = None, lines: np.ndarray | None = None, edges: np.ndarray | None = None) -> None:
+        self.__source = source
+
+        # (N, 3) positions, a view over the source vertices until some stage transforms them
+        self.__positions: np.ndarray = source.getPositionsArray() if positions is None else positions
+
+        # (M, 2, 3) segments to draw, used by 3D wireframes and surfaces
+        self.__lines: np.ndarray | None = lines
+
+        # (E, 2) edges to draw when they are not the ones of the source, like the grid of a surface
+        # or the edges left by the back-face culling
+        self.__edges: np.ndarray | None = edges
+
+        # Computed on the first use, the arrays of a proxy never change
+        self.__bounds: np.ndarray | None = None
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.type.name}) -> {len(self.__positions)} positions"
+
+    @property
+    def source(self) -> SGIObject:
+        return self.__source
+
+    @property
+    def id(self) -> int:
+        return self.__source.id
+
+    @property
+    def name(self) -> str:
+        return self.__source.name
+
+    @property
+    def type(self) -> ObjectsTypes:
+        return self.__source.type
+
+    @property
+    def color(self) -> tuple[int, int, int]:
+        return self.__source.color
+
+    @property
+    def filled(self) -> bool:
+        return getattr(self.__source, 'filled', False)
+
+    @property
+    def strategy(self):
+        return getattr(self.__source, 'strategy', None)
+
+    @property
+    def faces(self) -> list[list[int]]:
+        return self.__source.faces
+
+    @property
+    def edgeIndices(self) -> np.ndarray | None:
+        return getattr(self.__source, 'edgeIndices', None) if self.__edges is None else self.__edges
+
+    def is3D(self) -> bool:
+        return self.__source.type == ObjectsTypes.WIREFRAME and self.__source.is3D()
+
+    def getPositionsArray(self) -> np.ndarray:
+        return self.__positions
+
+    def getPositions(self) -> List[Position3D]:
+        return Position3D.fromArray(self.__positions)
+
+    @property
+    def position(self) -> Position3D:
+        x, y, z = self.__positions[0].tolist()
+        return Position3D(x, y, z)
+
+    @property
+    def lines(self) -> np.ndarray | None:
+        return self.__lines
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """ (2, 3) axis aligned bounding box of the positions, the minimum on the first row and the maximum on the second """
+        if self.__bounds is None:
+            if len(self.__positions) == 0:
+                self.__bounds = np.full((2, 3), np.nan)
+            else:
+                self.__bounds = np.stack([self.__positions.min(axis=0), self.__positions.max(axis=0)])
+
+        return self.__bounds
+
+    def withPositions(self, positions: np.ndarray) -> 'RenderProxy':
+        return RenderProxy(self.__source, np.asarray(positions, dtype=np.float64).reshape(-1, 3), self.__lines, self.__edges)
+
+    def withLines(self, lines: np.ndarray | None) -> 'RenderProxy':
+        if lines is not None:
+            lines = np.asarray(lines, dtype=np.float64).reshape(-1, 2, 3)
+
+        return RenderProxy(self.__source, self.__positions, lines, self.__edges)
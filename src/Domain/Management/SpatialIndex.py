@@ -0,0 +1,223 @@
+import math
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the XY plane of the world holding the axis aligned bounding box of each object.
+    Used to find the objects that may be inside the view volume without visiting the whole world
+    """
+    CELL_SIZE: float = 256.0
+    MAX_CELLS_PER_OBJECT: int = 1024
+
+    def __init__(self, cellSize: float = CELL_SIZE) -> None:
+        self.__cellSize = cellSize
+
+        # Object id -> (2, 3) array with the min and max corners
+        self.__bounds: dict[int, np.ndarray] = {}
+
+        self.__cells: dict[tuple[int, int], set[int]] = {}
+        self.__objectCells: dict[int, list[tuple[int, int]]] = {}
+
+        # Objects that cover too many cells are always returned as candidates
+        self.__oversized: set[int] = set()
+
+        self.__zRange: tuple[float, float] | None = None
+
+    def __len__(self) -> int:
+        return len(self.__bounds)
+
+    def bounds(self, objectId: int) -> np.ndarray | None:
+        return self.__bounds.get(objectId)
+
+    @property
+    def zRange(self) -> tuple[float, float] | None:
+        """ Depth interval covered by all objects of the world """
+        if self.__zRange is None and len(self.__bounds) > 0:
+            allBounds = np.array(list(self.__bounds.values()))
+            self.__zRange = (float(allBounds[:, 0, 2].min()), float(allBounds[:, 1, 2].max()))
+
+        return self.__zRange
+
+    def insert(self, objectId: int, vertices: np.ndarray) -> None:
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+
+        if len(vertices) == 0:
+            return
+
+        self.__place(objectId, np.array([vertices.min(axis=0), vertices.max(axis=0)]))
+
+    def __place(self, objectId: int, bounds: np.ndarray) -> None:
+        # Non finite coordinates can't be placed in the grid
+        if not np.all(np.isfinite(bounds)):
+            self.__oversized.add(objectId)
+            self.__bounds[objectId] = np.array([[-np.inf] * 3, [np.inf] * 3])
+            self.__zRange = None
+            return
+
+        self.__bounds[objectId] = bounds
+        self.__zRange = None
+
+        (ix0, iy0), (ix1, iy1) = self.__cellRange(bounds[0, :2], bounds[1, :2])
+
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self.MAX_CELLS_PER_OBJECT:
+            self.__oversized.add(objectId)
+            return
+
+        cells = [(ix, iy) for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1)]
+
+        for cell in cells:
+            self.__cells.setdefault(cell, set()).add(objectId)
+
+        self.__objectCells[objectId] = cells
+
+    def remove(self, objectId: int) -> None:
+        self.__bounds.pop(objectId, None)
+        self.__oversized.discard(objectId)
+        self.__zRange = None
+
+        for cell in self.__objectCells.pop(objectId, []):
+            objectsInCell = self.__cells[cell]
+            objectsInCell.discard(objectId)
+
+            if len(objectsInCell) == 0:
+                del self.__cells[cell]
+
+    def update(self, objectId: int, vertices: np.ndarray) -> None:
+        self.remove(objectId)
+        self.insert(objectId, vertices)
+
+    def updateVertex(self, objectId: int, previous: np.ndarray, vertex: np.ndarray, vertices: np.ndarray) -> None:
+        """
+        Bounds after a single vertex of the object moved from previous to vertex. When the previous position was
+        inside the box the other vertices are not visited, the box can only grow. When it was on the border the box
+        may shrink, so it is computed again from all the vertices
+        """
+        bounds = self.__bounds.get(objectId)
+
+        if bounds is None or not np.all(np.isfinite(previous)) or np.any(previous == bounds[0]) or np.any(previous == bounds[1]):
+            self.update(objectId, vertices)
+            return
+
+        grown = np.array([np.minimum(bounds[0], vertex), np.maximum(bounds[1], vertex)])
+
+        if np.array_equal(grown, bounds):
+            return
+
+        self.remove(objectId)
+        self.__place(objectId, grown)
+
+    def query(self, rectMin: np.ndarray, rectMax: np.ndarray) -> list[int]:
+        """
+        Objects whose bounding box meets the XY rectangle
+        """
+        (ix0, iy0), (ix1, iy1) = self.__cellRange(rectMin, rectMax)
+
+        # Visiting the cells would cost more than testing every box
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self.__bounds):
+            candidates = self.__bounds.keys()
+        else:
+            candidates = set(self.__oversized)
+
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    candidates.update(self.__cells.get((ix, iy), ()))
+
+        candidates = list(candidates)
+
+        if len(candidates) == 0:
+            return []
+
+        boxes = np.array([self.__bounds[objectId] for objectId in candidates])
+        overlaps = np.all(boxes[:, 0, :2] <= rectMax, axis=1) & np.all(boxes[:, 1, :2] >= rectMin, axis=1)
+
+        return [objectId for objectId, keep in zip(candidates, overlaps) if keep]
+
+    def queryView(self, matrix: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> list[int]:
+        """
+        Objects whose bounding box, once transformed by the (4, 4) matrix (column vectors, with homogeneous divide),
+        meets the XY rectangle. The world footprint of the view is computed for the depth interval of the world,
+        so only the cells under it are visited
+        """
+        if len(self.__bounds) == 0:
+            return []
+
+        footprint = self.__viewFootprint(matrix, rectMin, rectMax)
+
+        if footprint is None:
+            candidates = list(self.__bounds.keys())
+        else:
+            candidates = self.query(footprint[0], footprint[1])
+
+        if len(candidates) == 0:
+            return []
+
+        # Exact test with the 8 corners of each box
+        boxes = np.array([self.__bounds[objectId] for objectId in candidates])
+        boxes = np.where(np.isfinite(boxes), boxes, np.sign(boxes) * 1e300)
+
+        corners = np.empty((len(candidates), 8, 4))
+        for i in range(8):
+            corners[:, i, 0] = boxes[:, (i >> 0) & 1, 0]
+            corners[:, i, 1] = boxes[:, (i >> 1) & 1, 1]
+            corners[:, i, 2] = boxes[:, (i >> 2) & 1, 2]
+        corners[:, :, 3] = 1
+
+        with np.errstate(all='ignore'):
+            projected = corners @ np.asarray(matrix, dtype=np.float64).T
+            w = projected[:, :, 3]
+
+            # Corners behind the center of projection can't be bounded, keep the object
+            unbounded = np.any(w <= 1e-9, axis=1) | ~np.all(np.isfinite(projected), axis=(1, 2))
+
+            xy = projected[:, :, :2] / np.where(w > 1e-9, w, 1)[:, :, None]
+
+        visible = unbounded | (np.all(xy.min(axis=1) <= rectMax, axis=1) & np.all(xy.max(axis=1) >= rectMin, axis=1))
+
+        return [objectId for objectId, keep in zip(candidates, visible) if keep]
+
+    def __viewFootprint(self, matrix: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> np.ndarray | None:
+        """
+        XY bounding box of the world points between the world depth limits that are projected inside the rectangle.
+        For a fixed z the projection of (x, y) is solved as a 2x2 linear system, the region is convex so the
+        8 solutions (4 rectangle corners x 2 depths) bound it. Returns None if it is unbounded
+        """
+        zRange = self.zRange
+
+        if zRange is None or not np.all(np.isfinite(zRange)):
+            return None
+
+        matrix = np.asarray(matrix, dtype=np.float64)
+        points = []
+
+        for z in zRange:
+            for x, y in ((rectMin[0], rectMin[1]), (rectMin[0], rectMax[1]), (rectMax[0], rectMax[1]), (rectMax[0], rectMin[1])):
+                # (M0 - x M3) . p = 0 and (M1 - y M3) . p = 0, with p = (px, py, z, 1)
+                rowX = matrix[0] - x * matrix[3]
+                rowY = matrix[1] - y * matrix[3]
+
+                system = np.array([rowX[:2], rowY[:2]])
+                rhs = -np.array([rowX[2] * z + rowX[3], rowY[2] * z + rowY[3]])
+
+                if abs(np.linalg.det(system)) < 1e-12:
+                    return None
+
+                px, py = np.linalg.solve(system, rhs)
+
+                # The solution must be in front of the center of projection
+                if matrix[3] @ np.array([px, py, z, 1]) <= 1e-9:
+                    return None
+
+                points.append((px, py))
+
+        points = np.array(points)
+
+        return np.array([points.min(axis=0), points.max(axis=0)])
+
+    def __cellRange(self, rectMin: np.ndarray, rectMax: np.ndarray) -> tuple[tuple[int, int], tuple[int, int]]:
+        ix0 = math.floor(rectMin[0] / self.__cellSize)
+        iy0 = math.floor(rectMin[1] / self.__cellSize)
+        ix1 = math.floor(rectMax[0] / self.__cellSize)
+        iy1 = math.floor(rectMax[1] / self.__cellSize)
+
+        return (ix0, iy0), (ix1, iy1)
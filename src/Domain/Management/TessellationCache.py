@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+import numpy as np
+
+
+class TessellationCache:
+    """
+    Least recently used cache of the points generated for curves and surfaces.
+    Entries are keyed by (object id, geometry version, strategy, precision), so a key never gets stale: changing
+    the control points creates another key and the entries of the older versions of the object are dropped.
+
+    The cache is bounded by the bytes of the cached arrays, evicting the least recently used entries
+    """
+    MAX_BYTES: int = 64 * 1024 * 1024
+
+    def __init__(self, maxBytes: int = MAX_BYTES) -> None:
+        self.__maxBytes = maxBytes
+        self.__entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+        # Object id -> keys cached for it
+        self.__objectKeys: dict[int, set[tuple]] = {}
+
+        self.__sizeInBytes = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def sizeInBytes(self) -> int:
+        return self.__sizeInBytes
+
+    @property
+    def maxBytes(self) -> int:
+        return self.__maxBytes
+
+    def setMaxBytes(self, maxBytes: int) -> None:
+        self.__maxBytes = maxBytes
+        self.__evict()
+
+    def get(self, objectId: int, version: int, strategy: Hashable, precision: float) -> np.ndarray | None:
+        key = (objectId, version, strategy, precision)
+        points = self.__entries.get(key)
+
+        if points is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+
+        return points
+
+    def put(self, objectId: int, version: int, strategy: Hashable, precision: float, points: np.ndarray) -> np.ndarray:
+        """
+        Stores a read only copy of the points, they are shared by every frame. The copy keeps the entry intact
+        when the generator hands out a view of a buffer it updates later, as the curves do
+        """
+        key = (objectId, version, strategy, precision)
+
+        points = np.array(points, dtype=np.float64, copy=True)
+        points.setflags(write=False)
+
+        # The other versions of the object will never be asked again
+        for oldKey in [oldKey for oldKey in self.__objectKeys.get(objectId, ()) if oldKey[1] != version]:
+            self.__remove(oldKey)
+
+        if key in self.__entries:
+            self.__remove(key)
+
+        # Arrays bigger than the whole cache are not kept
+        if points.nbytes > self.__maxBytes:
+            return points
+
+        self.__entries[key] = points
+        self.__objectKeys.setdefault(objectId, set()).add(key)
+        self.__sizeInBytes += points.nbytes
+
+        self.__evict()
+
+        return points
+
+    def getOrGenerate(self, objectId: int, version: int, strategy: Hashable, precision: float, generate: Callable[[], np.ndarray]) -> np.ndarray:
+        points = self.get(objectId, version, strategy, precision)
+
+        if points is None:
+            points = self.put(objectId, version, strategy, precision, generate())
+
+        return points
+
+    def discard(self, objectId: int) -> None:
+        """ Drops every entry of the object """
+        for key in list(self.__objectKeys.get(objectId, ())):
+            self.__remove(key)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__objectKeys.clear()
+        self.__sizeInBytes = 0
+
+    def __remove(self, key: tuple) -> None:
+        points = self.__entries.pop(key)
+        self.__sizeInBytes -= points.nbytes
+
+        objectKeys = self.__objectKeys[key[0]]
+        objectKeys.discard(key)
+
+        if len(objectKeys) == 0:
+            del self.__objectKeys[key[0]]
+
+    def __evict(self) -> None:
+        while self.__sizeInBytes > self.__maxBytes and len(self.__entries) > 0:
+            self.__remove(next(iter(self.__entries)))
@@ -3,17 +3,27 @@ from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Coordinates import Dimensions3D, Position3D
 from Domain.Utils.Enums import ObjectsTypes
 from Domain.Utils.Constants import Constants
-from Domain.Utils.Transforms import Translation, Scale, GenericTransform
+from Domain.Utils.Enums import ProjectionMethods, RotationTypes
+from Domain.Utils.Transforms import Translation, Scale, Rotation, GenericTransform
 import numpy as np
 
 class Window(SGIObject):
     ZOOM_MOVE: int = 10
     MIN_SIZE: int = 50
     MAX_SIZE: int = 8000
+    PROJECTION_DISTANCE: int = 1000
+    NEAR_DISTANCE: int = 10
+    FAR_DISTANCE: int = 100000
     __SCALE: float = 0.1
     """
     The space from the world to be drawn, it should be available to zoom in and zoom out
-    and move in all 3 dimensions
+    and move in all 3 dimensions.
+
+    The camera matrices (world -> PPC -> normalized -> viewport) are cached and only rebuilt after
+    the window is zoomed, moved or rotated.
+
+    The rotation of the window is an orientation matrix around its center, the corners are kept aligned
+    with the axes of the view and the objects of the world are never rotated
     """
     def __init__(self, lenght: int, width: int, height: int) -> None:
         dimensions = Dimensions3D(lenght, width, height)
@@ -30,6 +40,18 @@ class Window(SGIObject):
                             Position3D(Constants.VIEWPORT_LENGTH / 2, Constants.VIEWPORT_WIDTH / 2, 1), 
                             Position3D(Constants.VIEWPORT_LENGTH / 2, -Constants.VIEWPORT_WIDTH / 2, 1)]
 
+        # Columns are the right, up and normal directions of the window in the world
+        self.__orientation = np.identity(3)
+        self.__projectionMethod = ProjectionMethods.PERSPECTIVE
+
+        # Camera cache, rebuilt on demand after any change of the window
+        self.__cameraVersion = 0
+        self.__projectionMatrix: np.ndarray | None = None
+        self.__normalizationMatrix: np.ndarray | None = None
+        self.__viewportMatrix: np.ndarray | None = None
+        self.__worldToViewportMatrix: np.ndarray | None = None
+        self.__positionsPPC: list[Position3D] | None = None
+        self.__clipPlanes: np.ndarray | None = None
 
         super().__init__(ObjectsTypes.WINDOW, "Window", dimensions, self.__positions[0])
     
@@ -71,12 +93,193 @@ class Window(SGIObject):
     
     def setAngle(self, angle: float, axis: str) -> None:
         self.__angle[axis] = angle
+        self.__invalidateCamera()
+
+    @property
+    def orientation(self) -> np.ndarray:
+        return self.__orientation
+
+    def rotate(self, angle: float, axis: str) -> None:
+        """
+        Rotates the window around its own axis and center, only the camera changes so the cost
+        doesn't depend on the amount of objects in the world
+        """
+        rotation = Rotation(angle, RotationTypes.CENTER_OBJECT, axis=axis).matrix()[:3, :3]
+        orientation = self.__orientation @ rotation
+
+        # Back to the closest rotation matrix, so the error of many rotations doesn't accumulate
+        u, _, vt = np.linalg.svd(orientation)
+        self.__orientation = u @ vt
+
+        self.setAngle((self.__angle[axis] + angle) % 360, axis)
+
+    @property
+    def projectionMethod(self) -> ProjectionMethods:
+        return self.__projectionMethod
+
+    def setProjectionMethod(self, projectionMethod: ProjectionMethods) -> None:
+        self.__projectionMethod = projectionMethod
+        self.__invalidateCamera()
+
+    @property
+    def viewMatrix(self) -> np.ndarray:
+        """ World -> view, rotates the world around the center of the window by the inverse orientation """
+        center = Position3D.toArray([self.centralPoint])[0]
+
+        viewMatrix = np.identity(4)
+        viewMatrix[:3, :3] = self.__orientation.T
+        viewMatrix[:3, 3] = center - self.__orientation.T @ center
+
+        return viewMatrix
     
     def getPositions(self) -> list[Position3D]:
         return self.__positions
     
     def setPositions(self, positions: list[Position3D]) -> None:
         self.__positions = positions
+        self.__invalidateCamera()
+
+    @property
+    def cameraKey(self) -> int:
+        """
+        Changes every time the camera changes, any geometry projected with another key is stale
+        """
+        return self.__cameraVersion
+
+    def __invalidateCamera(self) -> None:
+        self.__cameraVersion += 1
+        self.__projectionMatrix = None
+        self.__normalizationMatrix = None
+        self.__viewportMatrix = None
+        self.__worldToViewportMatrix = None
+        self.__positionsPPC = None
+        self.__clipPlanes = None
+
+    @property
+    def projectionMatrix(self) -> np.ndarray:
+        """ World -> PPC, column vectors, the homogeneous divide must follow it """
+        if self.__projectionMatrix is None:
+            self.__buildCamera()
+
+        return self.__projectionMatrix
+
+    @property
+    def normalizationMatrix(self) -> np.ndarray:
+        """ PPC -> normalized, the window goes to [0, 1] x [0, 1] with the y axis pointing down """
+        if self.__normalizationMatrix is None:
+            self.__buildCamera()
+
+        return self.__normalizationMatrix
+
+    @property
+    def viewportMatrix(self) -> np.ndarray:
+        """ Normalized -> viewport, including the slack around the drawing area """
+        if self.__viewportMatrix is None:
+            self.__buildCamera()
+
+        return self.__viewportMatrix
+
+    @property
+    def ppcToViewportMatrix(self) -> np.ndarray:
+        return self.viewportMatrix @ self.normalizationMatrix
+
+    @property
+    def worldToViewportMatrix(self) -> np.ndarray:
+        """ The whole camera path in a single matrix """
+        if self.__worldToViewportMatrix is None:
+            self.__buildCamera()
+
+        return self.__worldToViewportMatrix
+
+    @property
+    def positionsPPC(self) -> list[Position3D]:
+        """ Corners of the window in PPC, the clipping region """
+        if self.__positionsPPC is None:
+            self.__buildCamera()
+
+        return self.__positionsPPC
+
+    @property
+    def clipPlanes(self) -> np.ndarray:
+        """
+        (P, 4) planes of the view volume over the homogeneous world vertices, a vertex v is inside when v . plane >= 0.
+        The four sides of the window come first, followed by the near and far planes in the perspective
+        """
+        if self.__clipPlanes is None:
+            self.__buildCamera()
+
+        return self.__clipPlanes
+
+    def __buildCamera(self) -> None:
+        # In the view the window is on the plane z = center.z, facing +z
+        center = Position3D.toArray([self.centralPoint])[0]
+        cop = center - [0, 0, self.PROJECTION_DISTANCE]
+
+        if self.__projectionMethod == ProjectionMethods.PARALLEL:
+            # Drops every point on the plane of the window
+            projectionMatrix = np.array([
+                [1, 0, 0, 0],
+                [0, 1, 0, 0],
+                [0, 0, 0, center[2]],
+                [0, 0, 0, 1]
+            ])
+        else:
+            # COP to origin, perspective with the window plane at z = d and back, so the window is kept in place
+            d = self.PROJECTION_DISTANCE
+            perspectiveMatrix = np.array([
+                [1, 0, 0, 0],
+                [0, 1, 0, 0],
+                [0, 0, 1, 0],
+                [0, 0, 1/d, 0]
+            ])
+
+            toOrigin = Translation(-cop[0], -cop[1], -cop[2]).matrix().T
+            toCOP = Translation(cop[0], cop[1], cop[2]).matrix().T
+
+            projectionMatrix = toCOP @ perspectiveMatrix @ toOrigin
+
+        projectionMatrix = projectionMatrix @ self.viewMatrix
+
+        # The corners are already aligned with the view, so they are the window in PPC
+        positionsPPC = [Position3D(p.axisX, p.axisY, p.axisZ) for p in self.__positions]
+
+        # The bottom left corner of the window goes to (0, 1) and the top right to (1, 0)
+        xMin, yMin = positionsPPC[0].axisX, positionsPPC[0].axisY
+        normalizationMatrix = np.array([
+            [1 / self.dimensions.length, 0, 0, -xMin / self.dimensions.length],
+            [0, -1 / self.dimensions.width, 0, 1 + yMin / self.dimensions.width],
+            [0, 0, 0, 1],
+            [0, 0, 0, 1]
+        ])
+
+        slack = Constants.VIEWPORT_SLACK // 2
+        viewportMatrix = np.array([
+            [Constants.VIEWPORT_LENGTH, 0, 0, slack],
+            [0, Constants.VIEWPORT_WIDTH, 0, slack],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1]
+        ])
+
+        self.__projectionMatrix = projectionMatrix
+        self.__normalizationMatrix = normalizationMatrix
+        self.__viewportMatrix = viewportMatrix
+        self.__worldToViewportMatrix = viewportMatrix @ normalizationMatrix @ self.__projectionMatrix
+        self.__positionsPPC = positionsPPC
+
+        # A side of the window in PPC, like x >= xMin, is x - xMin * w >= 0 before the divide.
+        # Multiplying by the projection the planes work directly over the world vertices
+        xMax, yMax = positionsPPC[2].axisX, positionsPPC[2].axisY
+        x, y, w = projectionMatrix[0], projectionMatrix[1], projectionMatrix[3]
+
+        planes = [x - xMin * w, xMax * w - x, y - yMin * w, yMax * w - y]
+
+        if self.__projectionMethod == ProjectionMethods.PERSPECTIVE:
+            # In the perspective w is the distance to the COP over the projection distance
+            d = self.PROJECTION_DISTANCE
+            planes.append(w - np.array([0, 0, 0, self.NEAR_DISTANCE / d]))
+            planes.append(np.array([0, 0, 0, self.FAR_DISTANCE / d]) - w)
+
+        self.__clipPlanes = np.array(planes, dtype=np.float64)
 
     @property
     def centralPoint(self) -> Position3D:
@@ -98,11 +301,11 @@ class Window(SGIObject):
     
     def getCOP(self) -> Position3D:
         """
-        Center of Projection
+        Center of Projection, in the world, behind the center of the window along its normal
         """
-        vpn = Window.getVPN(self.__positions)
+        center = Position3D.toArray([self.centralPoint])[0]
+        cop = center - self.PROJECTION_DISTANCE * self.__orientation[:, 2]
 
-        cop = vpn * -1500
         return Position3D(cop[0], cop[1], cop[2])
     
     @property
@@ -138,6 +341,7 @@ class Window(SGIObject):
         final_transform = GenericTransform(positions=self.__positions)
         final_transform.add_transforms([translate, scale, translate_back])
         self.__positions = final_transform.execute()
+        self.__invalidateCamera()
         
         self.dimensions.printDimensions()
 
@@ -151,6 +355,7 @@ class Window(SGIObject):
     def recalculateDimensionsWithPositions(self):
         self.dimensions.length = abs(self.distanceBetweenPoints(self.__positions[0], self.__positions[3]))
         self.dimensions.width = abs(self.distanceBetweenPoints(self.__positions[1], self.__positions[0]))
+        self.__invalidateCamera()
     
     def distanceBetweenPoints(self, point1, point2):
         # Extrai as coordenadas dos pontos
@@ -183,6 +388,7 @@ class Window(SGIObject):
         final_transform = GenericTransform(positions=self.__positions)
         final_transform.add_transforms([translate, scale, translate_back])
         self.__positions = final_transform.execute()
+        self.__invalidateCamera()
 
         self.dimensions.printDimensions()
 
@@ -196,31 +402,10 @@ class Window(SGIObject):
         Retorna o vetor de direção que representa a direção para a esquerda da janela,
         considerando a rotação atual.
         """
-        # Supondo que self.angleX, self.angleY e self.angleZ representam os ângulos de rotação
-        # da janela em torno dos eixos X, Y e Z, respectivamente.
-        # Você precisa converter esses ângulos para radianos para usar as funções trigonométricas.
-        angle_x_rad = math.radians(self.angleX)
-        angle_y_rad = math.radians(self.angleY)
-        angle_z_rad = math.radians(self.angleZ)
-        
-        # Calcula as componentes do vetor de direção
-        x_component = -math.cos(angle_y_rad) * math.cos(angle_z_rad)
-        y_component = math.sin(angle_z_rad)
-        z_component = math.sin(angle_y_rad) * math.cos(angle_z_rad)
-        
-        return (x_component, y_component, z_component)
+        return tuple(-self.__orientation[:, 0])
 
     def get_up_vector(self):
-        angle_x_rad = math.radians(self.angleX)
-        angle_y_rad = math.radians(self.angleY)
-        angle_z_rad = math.radians(self.angleZ)
-        
-        # Calcula as componentes do vetor de direção
-        x_component = math.sin(angle_y_rad) * math.cos(angle_z_rad)
-        y_component = math.cos(angle_x_rad) * math.cos(angle_z_rad) * math.cos(angle_y_rad) - math.sin(angle_x_rad) * math.sin(angle_z_rad)
-        z_component = math.cos(angle_x_rad) * math.sin(angle_z_rad) * math.cos(angle_y_rad) + math.sin(angle_x_rad) * math.cos(angle_z_rad)
-        
-        return (x_component, y_component, z_component)
+        return tuple(self.__orientation[:, 1])
 
     def moveUp(self) -> None:
         up_vector = self.get_up_vector()
@@ -229,6 +414,7 @@ class Window(SGIObject):
             position.axisY += int(self.ZOOM_MOVE * up_vector[1])
             position.axisZ += int(self.ZOOM_MOVE * up_vector[2])
         self.setCentralPoint(self.dimensions.central_point(self.__positions[0]))
+        self.__invalidateCamera()
         self.printPositions()
         self.dimensions.printDimensions()
 
@@ -239,6 +425,7 @@ class Window(SGIObject):
             position.axisY -= int(self.ZOOM_MOVE * up_vector[1])
             position.axisZ -= int(self.ZOOM_MOVE * up_vector[2])
         self.setCentralPoint(self.dimensions.central_point(self.__positions[0]))
+        self.__invalidateCamera()
         self.printPositions()
         self.dimensions.printDimensions()
     
@@ -249,6 +436,7 @@ class Window(SGIObject):
             position.axisY += int(self.ZOOM_MOVE * left_vector[1])
             position.axisZ += int(self.ZOOM_MOVE * left_vector[2])
         self.setCentralPoint(self.dimensions.central_point(self.__positions[0]))
+        self.__invalidateCamera()
         self.printPositions()
         self.dimensions.printDimensions()
         
@@ -258,6 +446,7 @@ class Window(SGIObject):
             position.axisX -= int(self.ZOOM_MOVE * left_vector[0])
             position.axisY -= int(self.ZOOM_MOVE * left_vector[1])
             position.axisZ -= int(self.ZOOM_MOVE * left_vector[2])
-        self.setCentralPoint(self.dimensions.central_point(self.__positions[0]))       
+        self.setCentralPoint(self.dimensions.central_point(self.__positions[0]))
+        self.__invalidateCamera()       
         self.printPositions()
         self.dimensions.printDimensions()
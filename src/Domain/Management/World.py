@@ -1,28 +1,105 @@
-from typing import List
+from typing import Iterable, List
 
+from Domain.Management.GeometryStore import GeometryStore
+from Domain.Management.SpatialIndex import SpatialIndex
 from Domain.Shapes.SGIObject import SGIObject
+import numpy as np
 
 
 class World:
     """
-    Should keep all objects in the world
+    Should keep all objects in the world, the vertices of every object live in a single geometry store.
+    Objects are indexed by id and by name, iteration keeps the insertion order, and their bounding
+    boxes are kept in a spatial index to find the ones inside the view
     """
     def __init__(self) -> None:
-        self.__objects: List[SGIObject] = []
+        self.__objects: dict[int, SGIObject] = {}
+        self.__objectsByName: dict[str, dict[int, SGIObject]] = {}
+        self.__objectsList: List[SGIObject] | None = []
+        self.__insertionOrder: dict[int, int] = {}
+        self.__insertions = 0
+        self.__geometry = GeometryStore(self.__onGeometryChanged)
+        self.__spatialIndex = SpatialIndex()
 
     def addObject(self, object: SGIObject):
-        self.__objects.append(object)
+        object.attachStore(self.__geometry)
+
+        self.__objects[object.id] = object
+        self.__objectsByName.setdefault(object.name, {})[object.id] = object
+        self.__objectsList = None
+
+        self.__insertionOrder[object.id] = self.__insertions
+        self.__insertions += 1
+        self.__spatialIndex.insert(object.id, object.getPositionsArray())
+
+    def addObjects(self, objects: Iterable[SGIObject]):
+        for object in objects:
+            self.addObject(object)
+
+    @property
+    def objects(self) -> List[SGIObject]:
+        if self.__objectsList is None:
+            self.__objectsList = list(self.__objects.values())
+
+        return self.__objectsList
 
     @property
-    def objects(self):
-        return self.__objects
+    def geometry(self) -> GeometryStore:
+        return self.__geometry
+
+    @property
+    def spatialIndex(self) -> SpatialIndex:
+        return self.__spatialIndex
+
+    def __onGeometryChanged(self, objectId: int, previous: np.ndarray = None, vertex: np.ndarray = None) -> None:
+        if previous is not None:
+            self.__spatialIndex.updateVertex(objectId, previous, vertex, self.__geometry.getVertices(objectId))
+        else:
+            self.__spatialIndex.update(objectId, self.__geometry.getVertices(objectId))
+
+    def queryView(self, matrix: np.ndarray, rectMin: np.ndarray, rectMax: np.ndarray) -> List[SGIObject]:
+        """
+        Objects whose bounding box, transformed by the projection matrix, meets the window rectangle.
+        Keeps the insertion order, so the objects are drawn in the same order
+        """
+        objectIds = self.__spatialIndex.queryView(matrix, rectMin, rectMax)
+        objectIds.sort(key=self.__insertionOrder.__getitem__)
+
+        return [self.__objects[objectId] for objectId in objectIds]
     
-    def removeObjectById(self, objectId: int):
-        for object in self.__objects:
-            if object.id == objectId:
-                self.__objects.remove(object)
-
-    def getObjectById(self, objectId: int):
-        for object in self.__objects:
-            if object.id == objectId:
-                return object
+    def removeObjectById(self, objectId: int) -> SGIObject | None:
+        object = self.__objects.pop(objectId, None)
+
+        if object is None:
+            return None
+
+        sameName = self.__objectsByName[object.name]
+        del sameName[objectId]
+
+        if len(sameName) == 0:
+            del self.__objectsByName[object.name]
+
+        object.detachStore()
+        self.__objectsList = None
+
+        del self.__insertionOrder[objectId]
+        self.__spatialIndex.remove(objectId)
+
+        return object
+
+    def removeObjectsByIds(self, objectIds: Iterable[int]) -> List[SGIObject]:
+        removed = [self.removeObjectById(objectId) for objectId in objectIds]
+
+        return [object for object in removed if object is not None]
+
+    def getObjectById(self, objectId: int) -> SGIObject | None:
+        return self.__objects.get(objectId)
+
+    def getObjectByName(self, name: str) -> SGIObject | None:
+        """ First object added with the given name """
+        sameName = self.__objectsByName.get(name)
+
+        if sameName is None:
+            return None
+
+        return next(iter(sameName.values()))
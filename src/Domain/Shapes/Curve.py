@@ -3,14 +3,21 @@ from Domain.Utils.Coordinates import Dimensions3D, Position3D
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Enums import ObjectsTypes, CurvePlottingMethods
 from Domain.Shapes.Point import Point
+import numpy as np
 
 
 class Curve(SGIObject):
-    def __init__(self, name: str, positions: List[Point], strategy: CurvePlottingMethods) -> None:
-        super().__init__(ObjectsTypes.CURVE, name, Dimensions3D(0, 0, 0), positions[0])
-        self.__points = positions
+    def __init__(self, name: str, positions: List[Point] | np.ndarray, strategy: CurvePlottingMethods) -> None:
+        vertices = Point.toArray(positions)
+
+        super().__init__(ObjectsTypes.CURVE, name, Dimensions3D(0, 0, 0), Position3D(*vertices[0]), vertices=vertices)
         self.__filled: bool = False
         self.__strategy = strategy
+
+        # (K, S, 3) tessellation of each segment, kept between edits so only the segments of the moved points are evaluated again
+        self.__segmentPoints: np.ndarray | None = None
+        self.__segmentPrecision: float | None = None
+        self.__editedControlPoints: set[int] = set()
     
     @property
     def strategy(self) -> CurvePlottingMethods:
@@ -23,24 +30,55 @@ class Curve(SGIObject):
     @filled.setter
     def filled(self, value: bool) -> None:
         self.__filled = value
+        self.touch()
     
     def addPoint(self, point: Point) -> None:
-        self.__points.append(point)
-        
-    def getPositions(self) -> List[Position3D]:
-        return [x.position for x in self.__points]
-    
-    def setPositions(self, positions: List[Position3D]) -> None:
-        self.__points = []
-        
-        for i, pos in enumerate(positions):
-            self.__points.append(Point(pos.axisX, pos.axisY, pos.axisZ, f'{self.name}_{i}'))
+        self.setPositionsArray(np.concatenate([self.getPositionsArray(), point.getPositionsArray()]))
+
+    def setPositionsArray(self, vertices: np.ndarray) -> None:
+        super().setPositionsArray(vertices)
+
+        # Every segment may have changed, the buffers are built again
+        self.__segmentPoints = None
+        self.__editedControlPoints.clear()
+
+    def moveControlPoint(self, index: int, position: Position3D) -> None:
+        """ Moves one control point, only the segments that depend on it are tessellated again """
+        count = len(self.getPositionsArray())
+
+        if not -count <= index < count:
+            raise IndexError(f"{self.name} has no control point {index}")
+
+        index %= count
+
+        self.setVertex(index, Position3D.toArray([position])[0])
+
+        if self.__segmentPoints is not None:
+            self.__editedControlPoints.add(index)
+
+    def segmentPoints(self, precision: float) -> np.ndarray | None:
+        """ (K, S, 3) tessellation of the segments at the precision, None when it has to be built again """
+        if precision != self.__segmentPrecision:
+            return None
+
+        return self.__segmentPoints
+
+    def setSegmentPoints(self, precision: float, points: np.ndarray) -> None:
+        self.__segmentPoints = points
+        self.__segmentPrecision = precision
+        self.__editedControlPoints.clear()
+
+    def takeEditedControlPoints(self) -> np.ndarray:
+        """ Indices of the control points moved since the buffers were last updated """
+        edited = np.array(sorted(self.__editedControlPoints), dtype=np.int64)
+        self.__editedControlPoints.clear()
+
+        return edited
             
     @property
     def centralPoint(self) -> Position3D:
-        x = sum([point.position.axisX for point in self.__points]) // len(self.__points)
-        y = sum([point.position.axisY for point in self.__points]) // len(self.__points)
-        z = sum([point.position.axisZ for point in self.__points]) // len(self.__points)
+        vertices = self.getPositionsArray()
+        x, y, z = (np.trunc(vertices).sum(axis=0) // len(vertices)).tolist()
         
         return Position3D(x, y, z)
         
@@ -10,36 +10,29 @@ class Line(SGIObject):
     def __init__(self, pointOne: Point, pointTwo: Point, name: str = "Linha") -> None:
         dimensions = Dimensions3D(1, 1, 1)
 
-        self.__pointOne = pointOne
-        self.__pointTwo = pointTwo
-
-        super().__init__(ObjectsTypes.LINE, name, dimensions, pointOne.position)
+        super().__init__(ObjectsTypes.LINE, name, dimensions, pointOne.position, vertices=Point.toArray([pointOne, pointTwo]))
 
     def __str__(self):
-        return f"P1: ({self.__pointOne.position.axisX}, {self.__pointOne.position.axisY}) - P2: P1: ({self.__pointTwo.position.axisX}, {self.__pointTwo.position.axisY})"
-
-    def getPositions(self) -> List[Position3D]:
-        return [self.pointOne.position, self.pointTwo.position]
-
-    def setPositions(self, positions: List[Position3D]) -> None:
-        self.__pointOne.position = positions[0]
-        self.__pointTwo.position = positions[1]
+        pointOne, pointTwo = self.getPositions()
+        return f"P1: ({pointOne.axisX}, {pointOne.axisY}) - P2: P1: ({pointTwo.axisX}, {pointTwo.axisY})"
 
     @property
     def pointOne(self) -> Point:
-        return self.__pointOne
+        return Point(*self.getPositionsArray()[0].tolist())
 
     @property
     def pointTwo(self) -> Point:
-        return self.__pointTwo
+        return Point(*self.getPositionsArray()[1].tolist())
     
     @property
     def centralPoint(self) -> Position3D:
+        pointOne, pointTwo = self.getPositions()
+
         # Find the central point between the two points
         return Position3D(
-            (self.__pointOne.position.axisX + self.__pointTwo.position.axisX) // 2,
-            (self.__pointOne.position.axisY + self.__pointTwo.position.axisY) // 2,
-            (self.__pointOne.position.axisZ + self.__pointTwo.position.axisZ) // 2
+            (pointOne.axisX + pointTwo.axisX) // 2,
+            (pointOne.axisY + pointTwo.axisY) // 2,
+            (pointOne.axisZ + pointTwo.axisZ) // 2
         )
         
-        
\ No newline at end of file
+        
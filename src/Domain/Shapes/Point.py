@@ -2,6 +2,7 @@ from typing import List
 from Domain.Utils.Coordinates import Dimensions3D, Position3D
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Enums import ObjectsTypes
+import numpy as np
 
 
 class Point(SGIObject):
@@ -14,7 +15,17 @@ class Point(SGIObject):
     @staticmethod
     def fromPosition(position: Position3D, name: str = "Ponto") -> 'Point':
         return Point(position.axisX, position.axisY, position.axisZ, name)
+
+    @staticmethod
+    def toArray(points: List['Point'] | np.ndarray) -> np.ndarray:
+        """
+        Packs the positions of the points in a (N, 3) float64 array, arrays are passed through
+        """
+        if isinstance(points, np.ndarray):
+            return np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        return np.concatenate([point.getPositionsArray() for point in points]) if len(points) > 0 else np.empty((0, 3))
     
     def getPositions(self) -> List[Position3D]:
         return [self.position]
-    
\ No newline at end of file
+    
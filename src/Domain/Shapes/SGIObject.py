@@ -1,40 +1,148 @@
-from typing import List
+from copy import deepcopy
+from typing import List, TYPE_CHECKING
 from Domain.Utils.Coordinates import Dimensions3D, Position3D
 from Domain.Utils.Enums import ObjectsTypes
 from Domain.Utils.IdGenerator import IdGenerator
+import numpy as np
+
+if TYPE_CHECKING:
+    from Domain.Management.GeometryStore import GeometryStore
 
 class SGIObject:
-    def __init__(self, type: ObjectsTypes, name: str, dimensions: Dimensions3D, position: Position3D, color: tuple[int, int, int] = (0, 0, 0)) -> None:
+    def __init__(self, type: ObjectsTypes, name: str, dimensions: Dimensions3D, position: Position3D, color: tuple[int, int, int] = (0, 0, 0), vertices: np.ndarray = None) -> None:
         self.__id = IdGenerator.generate_id()
-        self.__name = name 
-        self.__position: Position3D = position
+        self.__name = name
         self.__dimensions: Dimensions3D = dimensions
         self.__type = type
         self.__color = color
 
+        # Bumped by every mutator, used to know when the geometry derived from the object is stale
+        self.__version = 0
+
+        # Only bumped when the vertices or the topology change, the color or the fill keep the geometry
+        self.__geometryVersion = 0
+
+        # Vertices are kept locally until the object is added to the world, then they live in the geometry store
+        self.__vertices: np.ndarray = Position3D.toArray([position]) if vertices is None else np.array(vertices, dtype=np.float64).reshape(-1, 3)
+        self.__topology: np.ndarray | None = None
+        self.__store: 'GeometryStore' = None
+
     def __str__(self) -> str:
         return f"{self.name} ({self.type.name}) -> {self.position}"
-    
+
+    def __deepcopy__(self, memo: dict) -> 'SGIObject':
+        """
+        Copies the object detached from the geometry store, so the world buffer is never cloned with it
+        """
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+
+        for key, value in self.__dict__.items():
+            if key not in ('_SGIObject__vertices', '_SGIObject__topology', '_SGIObject__store'):
+                clone.__dict__[key] = deepcopy(value, memo)
+
+        topology = self.getTopologyArray()
+
+        clone.__vertices = self.getPositionsArray().copy()
+        clone.__topology = None if topology is None else topology.copy()
+        clone.__store = None
+
+        return clone
+
     @property
     def color(self) -> tuple[int, int, int]:
         return self.__color
-    
+
     def setColor(self, color: tuple[int, int, int]) -> None:
         self.__color = color
-    
+        self.touch()
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    @property
+    def geometryVersion(self) -> int:
+        return self.__geometryVersion
+
+    def touch(self) -> None:
+        """ Marks the object as changed """
+        self.__version += 1
+
     @property
     def type(self) -> ObjectsTypes:
         return self.__type
-    
+
+    def attachStore(self, store: 'GeometryStore') -> None:
+        """ Moves the vertices and topology of the object to the geometry store """
+        store.allocate(self.__id, self.__vertices, self.__topology)
+
+        self.__store = store
+        self.__vertices = None
+        self.__topology = None
+
+    def detachStore(self) -> None:
+        """ Takes back a copy of the vertices and topology from the geometry store """
+        if self.__store is None:
+            return
+
+        topology = self.__store.getTopology(self.__id)
+
+        self.__vertices = self.__store.getVertices(self.__id).copy()
+        self.__topology = None if topology is None else topology.copy()
+        self.__store.release(self.__id)
+        self.__store = None
+
+    def getPositionsArray(self) -> np.ndarray:
+        """ (N, 3) float64 view over the vertices of the object """
+        if self.__store is not None:
+            return self.__store.getVertices(self.__id)
+
+        return self.__vertices
+
+    def setPositionsArray(self, vertices: np.ndarray) -> None:
+        if self.__store is not None:
+            self.__store.setVertices(self.__id, vertices)
+        else:
+            self.__vertices = np.array(vertices, dtype=np.float64).reshape(-1, 3)
+
+        self.__geometryVersion += 1
+        self.touch()
+
+    def setVertex(self, index: int, vertex: np.ndarray) -> None:
+        """ Moves a single vertex without copying the others """
+        if self.__store is not None:
+            self.__store.setVertex(self.__id, index, vertex)
+        else:
+            self.__vertices[index] = vertex
+
+        self.__geometryVersion += 1
+        self.touch()
+
+    def getTopologyArray(self) -> np.ndarray | None:
+        if self.__store is not None:
+            return self.__store.getTopology(self.__id)
+
+        return self.__topology
+
+    def setTopologyArray(self, topology: np.ndarray | None) -> None:
+        if self.__store is not None:
+            self.__store.setTopology(self.__id, topology)
+        else:
+            self.__topology = topology
+
+        self.__geometryVersion += 1
+        self.touch()
+
     def getPositions(self) -> List[Position3D]:
-        return [self.__position]
-    
+        return Position3D.fromArray(self.getPositionsArray())
+
     def setPositions(self, positions: List[Position3D]) -> None:
-        self.__position = positions[0]
+        self.setPositionsArray(Position3D.toArray(positions))
 
     @property
     def centralPoint(self) -> Position3D:
-        return self.__dimensions.central_point(self.__position)
+        return self.__dimensions.central_point(self.position)
 
     def setCentralPoint(self, central_point: Position3D) -> None:
         """ Define o ponto central das dimensões do objeto """
@@ -45,24 +153,28 @@ class SGIObject:
             central_point.axisZ - self.dimensions.height / 2
         )
 
-        self.position = new_position        
-        
+        self.position = new_position
+
     @property
     def dimensions(self) -> Dimensions3D:
         return self.__dimensions
-    
+
     @property
     def position(self) -> Position3D:
-        return self.__position
-    
+        x, y, z = self.getPositionsArray()[0].tolist()
+        return Position3D(x, y, z)
+
     @position.setter
     def position(self, value: Position3D) -> None:
-        self.__position = value
-    
+        vertices = self.getPositionsArray().copy()
+        vertices[0] = Position3D.toArray([value])[0]
+
+        self.setPositionsArray(vertices)
+
     @property
     def id(self) -> int:
         return self.__id
-    
+
     @property
     def name(self) -> str:
         return self.__name
\ No newline at end of file
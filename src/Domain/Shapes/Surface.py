@@ -2,20 +2,59 @@ from Domain.Shapes.Line import Line
 from Domain.Shapes.SGIObject import SGIObject
 from typing import List
 from Domain.Utils.Coordinates import Dimensions3D, Position3D
-from Domain.Utils.Enums import ObjectsTypes
+from Domain.Utils.Enums import ObjectsTypes, CurvePlottingMethods, SurfaceEvaluationMethods
 from Domain.Shapes.Point import Point
+from Domain.Utils.Splines import Splines
 import numpy as np
 
 class Surface(SGIObject):
-    def __init__(self, name: str, positions: list[Point], filled: bool = False) -> None:
-        super().__init__(ObjectsTypes.SURFACE, name, Dimensions3D(0, 0, 0), positions[0])
-        self.__points = positions
+    # (rows, columns) -> (E, 2) edges of the grid
+    __gridEdges: dict[tuple[int, int], np.ndarray] = {}
+
+    def __init__(self, name: str, positions: list[Point] | np.ndarray, filled: bool = False, strategy: CurvePlottingMethods = CurvePlottingMethods.BEZIER, columns: int = None) -> None:
+        """
+        The positions are the control net stored row by row, with columns points in each row.
+        Without the columns the net is taken as a square
+        """
+        vertices = Point.toArray(positions)
+
+        super().__init__(ObjectsTypes.SURFACE, name, Dimensions3D(0, 0, 0), Position3D(*vertices[0]), vertices=vertices)
         self.__filled = filled
         self.__lines: List[Line] = []
+        self.__strategy = strategy
+        self.__columns = int(round(len(vertices) ** 0.5)) if columns is None else columns
+
+        if Surface.patchCount(len(vertices) // self.__columns, self.__columns, strategy) == (0, 0) or len(vertices) % self.__columns != 0:
+            raise ValueError(f"Control net of {len(vertices)} points with {self.__columns} columns has no {strategy.value} patch")
+
+        self.__coefficients = self.__patchCoefficients()
+
+    @property
+    def strategy(self) -> CurvePlottingMethods:
+        return self.__strategy
 
-        self.__X_matrix = self.__geometryBezierMatrix('x')
-        self.__Y_matrix = self.__geometryBezierMatrix('y')
-        self.__Z_matrix = self.__geometryBezierMatrix('z')
+    @property
+    def netShape(self) -> tuple[int, int]:
+        """ Rows and columns of the control net """
+        return len(self.getPositionsArray()) // self.__columns, self.__columns
+
+    @staticmethod
+    def patchCount(rows: int, columns: int, strategy: CurvePlottingMethods) -> tuple[int, int]:
+        """
+        Patches of a rows x columns net. Bezier patches share their border control points, so the net needs
+        3k + 1 points on each side, B-spline patches are one for each 4 x 4 window of the net.
+        (0, 0) when the net has no patch
+        """
+        if strategy == CurvePlottingMethods.BSPLINE:
+            if rows < 4 or columns < 4:
+                return 0, 0
+
+            return rows - 3, columns - 3
+
+        if rows < 4 or columns < 4 or (rows - 1) % 3 != 0 or (columns - 1) % 3 != 0:
+            return 0, 0
+
+        return (rows - 1) // 3, (columns - 1) // 3
 
     @property
     def filled(self) -> bool:
@@ -24,84 +63,148 @@ class Surface(SGIObject):
     @filled.setter
     def filled(self, value: bool) -> None:
         self.__filled = value
+        self.touch()
+
+    def __patchCoefficients(self) -> np.ndarray:
+        """
+        (Pr, Pc, 3, 4, 4) matrices M G M^T of the x, y and z axes of every patch,
+        G being the 4 x 4 control points of the patch on the axis
+        """
+        rows, columns = self.netShape
+        patchRows, patchColumns = Surface.patchCount(rows, columns, self.__strategy)
+        net = self.getPositionsArray().reshape(rows, columns, 3)
 
-    def __geometryBezierMatrix(self, axis: str) -> np.ndarray:
-        matrix = []
-        if axis == 'x':
-            for i in range(4):
-                row = []
-                for j in range(4):
-                    ij = i * 4 + j
-                    row.append(self.__points[ij].position.axisX)
-                matrix.append(row)
-        elif axis == 'y':
-            for i in range(4):
-                row = []
-                for j in range(4):
-                    ij = i * 4 + j
-                    row.append(self.__points[ij].position.axisY)
-                matrix.append(row)
-        elif axis == 'z':
-            for i in range(4):
-                row = []
-                for j in range(4):
-                    ij = i * 4 + j
-                    row.append(self.__points[ij].position.axisZ)
-                matrix.append(row)
-                
-        return np.array(matrix)
+        # First row and column of the control net used by each patch
+        stride = 1 if self.__strategy == CurvePlottingMethods.BSPLINE else 3
+        rowIndex = (np.arange(patchRows) * stride)[:, None] + np.arange(4)
+        columnIndex = (np.arange(patchColumns) * stride)[:, None] + np.arange(4)
+
+        geometry = net[rowIndex[:, None, :, None], columnIndex[None, :, None, :]].transpose(0, 1, 4, 2, 3)
+        basisMatrix = Splines.BSPLINE_MATRIX if self.__strategy == CurvePlottingMethods.BSPLINE else Splines.BEZIER_MATRIX
+
+        return basisMatrix @ geometry @ basisMatrix.T
     
     def getLinesToDraw(self) -> List[Line]:
         return self.__lines
     
     def setLinesToDraw(self, lines: List[Line]) -> None:
         self.__lines = lines
-    
-    def getPositions(self) -> List[Position3D]:
-        return [x.position for x in self.__points]
-    
-    def generatePositions(self, step: float) -> List[Position3D]:
-        positions = []
-        s = 0
-        t = 0
-        
-        bezierMatrix = np.array([
-            [-1, 3, -3, 1],
-            [3, -6, 3, 0],
-            [-3, 3, 0, 0],
-            [1, 0, 0, 0]
+
+    @classmethod
+    def gridEdges(cls, rows: int, columns: int) -> np.ndarray:
+        """
+        (E, 2) vertex indices of the edges of a rows x columns grid stored row by row,
+        each vertex followed by its right and bottom neighbors
+        """
+        edges = cls.__gridEdges.get((rows, columns))
+
+        if edges is None:
+            index = np.arange(rows * columns).reshape(rows, columns)
+
+            right = np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1)
+            bottom = np.stack([index[:-1, :].ravel(), index[1:, :].ravel()], axis=1)
+
+            edges = np.concatenate([right, bottom])
+            order = np.argsort(edges[:, 0] * 2 + np.repeat([0, 1], [len(right), len(bottom)]), kind='stable')
+
+            edges = edges[order].reshape(-1, 2)
+            edges.setflags(write=False)
+
+            cls.__gridEdges[(rows, columns)] = edges
+
+        return edges
+
+    @staticmethod
+    def forwardDifferenceMatrix(step: float) -> np.ndarray:
+        """ E(step), takes the power coefficients [a, b, c, d] to the initial forward differences of a cubic """
+        return np.array([
+            [0, 0, 0, 1],
+            [step**3, step**2, step, 0],
+            [6 * step**3, 2 * step**2, 0, 0],
+            [6 * step**3, 0, 0, 0]
         ])
-        
-        while s <= 1:
-            S_matrix = np.array([1, s, s**2, s**3])
-            while t <= 1:
-                T_matrix = np.array([1, t, t**2, t**3])
-                x = S_matrix @ bezierMatrix @ self.__X_matrix @ bezierMatrix.T @ T_matrix.T
-                y = S_matrix @ bezierMatrix @ self.__Y_matrix @ bezierMatrix.T @ T_matrix.T
-                z = S_matrix @ bezierMatrix @ self.__Z_matrix @ bezierMatrix.T @ T_matrix.T
-                
-                positions.append(Position3D(x, y, z))
-                
-                t += step
-            t = 0
-            s += step
-
-        return positions
+
+    def __evaluateDirect(self, basis: np.ndarray) -> np.ndarray:
+        """ (Pr, Pc, 3, S, T) samples of all patches with two broadcast products """
+        return basis @ self.__coefficients @ basis.T
+
+    def __evaluateForwardDifferences(self, basis: np.ndarray, step: float) -> np.ndarray:
+        """
+        (Pr, Pc, 3, S, T) samples of all patches with additions only. E(step) C E(step)^T gives the forward differences
+        along s and t at once, walking s produces the differences along t of every row of samples, then walking t
+        produces the points of all rows, patches and axes together. S + T additions of whole arrays.
+
+        The last sample is 1, which is not a multiple of the step when the step does not divide 1,
+        so the last row and column are evaluated directly
+        """
+        samples = len(basis)
+        uniform = samples - 1
+
+        stepMatrix = self.forwardDifferenceMatrix(step)
+        differences = stepMatrix @ self.__coefficients @ stepMatrix.T
+
+        # (Pr, Pc, 3, S - 1, 4) differences along t of each row of samples
+        rowDifferences = np.empty(differences.shape[:3] + (uniform, 4))
+
+        for row in range(uniform):
+            rowDifferences[..., row, :] = differences[..., 0, :]
+
+            differences[..., 0, :] += differences[..., 1, :]
+            differences[..., 1, :] += differences[..., 2, :]
+            differences[..., 2, :] += differences[..., 3, :]
+
+        values = np.empty(differences.shape[:3] + (samples, samples))
+
+        for column in range(uniform):
+            values[..., :uniform, column] = rowDifferences[..., 0]
+
+            rowDifferences[..., 0] += rowDifferences[..., 1]
+            rowDifferences[..., 1] += rowDifferences[..., 2]
+            rowDifferences[..., 2] += rowDifferences[..., 3]
+
+        values[..., -1, :] = basis[-1] @ self.__coefficients @ basis.T
+        values[..., :, -1] = basis @ self.__coefficients @ basis[-1]
+
+        return values
+
+    def generateGrid(self, step: float, method: SurfaceEvaluationMethods = SurfaceEvaluationMethods.DIRECT) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluates all patches at s, t = 0, step, 2 * step, ... < 1 and 1, with the product S (M G M^T) T^T
+        or with forward differences. The border samples shared by neighbor patches are kept once, so the result
+        is a single (R, C, 3) grid of points over the whole surface, returned with its (E, 2) edges over the flattened grid
+        """
+        basis = Splines.powerBasis(step)
+        samples = len(basis)
+
+        if method == SurfaceEvaluationMethods.FORWARD_DIFFERENCES:
+            patches = self.__evaluateForwardDifferences(basis, Splines.clampStep(step))
+        else:
+            patches = self.__evaluateDirect(basis)
+
+        # (Pr, Pc, 3, S, T) -> (Pr, S, Pc, T, 3)
+        patches = patches.transpose(0, 3, 1, 4, 2)
+        patchRows, _, patchColumns, _, _ = patches.shape
+
+        # The first sample of each patch is the last of the previous one, only the first patch keeps it
+        rows = np.concatenate([patches[:1, :1], patches[:, 1:].reshape(1, patchRows * (samples - 1), patchColumns, samples, 3)], axis=1)[0]
+        grid = np.concatenate([rows[:, :1, :1], rows[:, :, 1:].reshape(len(rows), 1, patchColumns * (samples - 1), 3)], axis=2)[:, 0]
+
+        return grid, self.gridEdges(grid.shape[0], grid.shape[1])
     
-    def setPositions(self, positions: List[Position3D]) -> None:
-        self.__points: List[Point] = []
-        
-        for i, pos in enumerate(positions):
-            self.__points.append(Point(pos.axisX, pos.axisY, pos.axisZ, f'{self.name}_{i}'))
+    def generatePositions(self, step: float, method: SurfaceEvaluationMethods = SurfaceEvaluationMethods.DIRECT) -> np.ndarray:
+        """ (R * C, 3) points of the surface, row by row """
+        grid, _ = self.generateGrid(step, method)
+
+        return grid.reshape(-1, 3)
+    
+    def setPositionsArray(self, vertices: np.ndarray) -> None:
+        super().setPositionsArray(vertices)
             
-        self.__X_matrix = self.__geometryBezierMatrix('x')
-        self.__Y_matrix = self.__geometryBezierMatrix('y')
-        self.__Z_matrix = self.__geometryBezierMatrix('z')
+        self.__coefficients = self.__patchCoefficients()
             
     @property
     def centralPoint(self) -> Position3D:
-        x = sum([point.position.axisX for point in self.__points]) // len(self.__points)
-        y = sum([point.position.axisY for point in self.__points]) // len(self.__points)
-        z = sum([point.position.axisZ for point in self.__points]) // len(self.__points)
+        vertices = self.getPositionsArray()
+        x, y, z = (np.trunc(vertices).sum(axis=0) // len(vertices)).tolist()
         
-        return Position3D(x, y, z)
\ No newline at end of file
+        return Position3D(x, y, z)
@@ -4,26 +4,167 @@ from Domain.Utils.Coordinates import Dimensions3D, Position3D
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Enums import ObjectsTypes
 from Domain.Shapes.Point import Point
+import numpy as np
 
 
 class WireFrame(SGIObject):
-    def __init__(self, name: str, positions: List[Point], filled: bool = False, faces: list[int] = None, lines: List[Line] = []) -> None:
-        super().__init__(ObjectsTypes.WIREFRAME, name, Dimensions3D(0, 0, 0), positions[0])
-        self.__points = positions
+    def __init__(self, name: str, positions: List[Point] | np.ndarray, filled: bool = False, faces: list[list[int]] | np.ndarray = None, lines: List[Line] = [], edges: tuple[np.ndarray, np.ndarray] = None) -> None:
+        vertices = Point.toArray(positions)
+
+        super().__init__(ObjectsTypes.WIREFRAME, name, Dimensions3D(0, 0, 0), Position3D(*vertices[0]), vertices=vertices)
         self.__filled: bool = filled
-        self.__faces = faces
         self.__lines: List[Line] = lines
+        self.__edges: np.ndarray | None = None
+
+        # Unique edge and face of each edge of each face, used to find the edges of a subset of the faces
+        self.__faceEdgeToEdge: np.ndarray | None = None
+        self.__faceEdgeToFace: np.ndarray | None = None
+
+        # Geometry version -> (normals, centers) of the faces, recoloring or filling keeps them
+        self.__faceGeometry: tuple[int, np.ndarray, np.ndarray] | None = None
+
+        if faces is not None:
+            self.setTopologyArray(WireFrame.packFaces(faces), edges)
+
+    @staticmethod
+    def packFaces(faces: list[list[int]] | np.ndarray) -> np.ndarray:
+        """
+        Packs the 1-based OBJ faces in a (F, K) int64 array of 0-based indices, padded with -1.
+        Arrays are considered already packed
+        """
+        if isinstance(faces, np.ndarray):
+            return faces
+
+        width = max([len(face) for face in faces], default=0)
+        packed = np.full((len(faces), width), -1, dtype=np.int64)
+
+        for i, face in enumerate(faces):
+            packed[i, :len(face)] = np.asarray(face, dtype=np.int64) - 1
+
+        return packed
+
+    @staticmethod
+    def faceEdges(faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (E, 2) 0-based vertex indices of the edges of every face, in the order of the faces,
+        and the (E,) index of the face of each edge
+        """
+        valid = faces >= 0
+        lengths = valid.sum(axis=1)
+
+        # The previous vertex of each one, the first is closed with the last
+        previous = np.roll(faces, 1, axis=1)
+        previous[:, 0] = faces[np.arange(len(faces)), np.maximum(lengths - 1, 0)]
+
+        return np.stack([previous[valid], faces[valid]], axis=1), np.nonzero(valid)[0]
+
+    @staticmethod
+    def uniqueEdges(faces: np.ndarray) -> np.ndarray:
+        """
+        (E, 2) 0-based vertex indices of the undirected edges of the packed faces, each edge only once
+        even when shared by two faces. The smaller index comes first and the edges are sorted
+        """
+        return WireFrame.topologyEdges(faces)[0]
+
+    @staticmethod
+    def topologyEdges(faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The (E, 2) unique edges of the packed faces, as in uniqueEdges, and the index of the unique edge
+        of each edge returned by faceEdges
+        """
+        faceEdges, _ = WireFrame.faceEdges(faces)
+        faceEdges = np.sort(faceEdges, axis=1)
+
+        # Each edge as one integer, unique over a flat array is much faster than over rows and keeps the same order
+        base = int(faceEdges.max(initial=0)) + 1
+        keys, faceEdgeToEdge = np.unique(faceEdges[:, 0] * base + faceEdges[:, 1], return_inverse=True)
+
+        return np.stack([keys // base, keys % base], axis=1), faceEdgeToEdge.reshape(-1)
+
+    def setTopologyArray(self, topology: np.ndarray | None, edges: tuple[np.ndarray, np.ndarray] = None) -> None:
+        """ The edges, as returned by topologyEdges, can be given when they are already known for the topology """
+        super().setTopologyArray(topology)
+
+        # Transforms only move the vertices, so the edges are extracted once per topology
+        if topology is None:
+            self.__edges = self.__faceEdgeToEdge = self.__faceEdgeToFace = None
+            return
+
+        self.__faceEdgeToFace = np.nonzero(topology >= 0)[0]
+        self.__edges, self.__faceEdgeToEdge = WireFrame.topologyEdges(topology) if edges is None else edges
+
+    def edgesOfFaces(self, faces: np.ndarray) -> np.ndarray:
+        """ (E, 2) unique edges used by at least one of the faces selected by the (F,) boolean mask """
+        used = np.zeros(len(self.__edges), dtype=bool)
+        used[self.__faceEdgeToEdge[faces[self.__faceEdgeToFace]]] = True
+
+        return self.__edges[used]
+
+    def __computeFaceGeometry(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Newell normals and centers of all faces at once. The normals are turned away from the center of the mesh,
+        the OBJ files are not always wound in the same direction, which is exact for convex meshes
+        """
+        vertices = self.getPositionsArray()
+        edges, faceOfEdge = WireFrame.faceEdges(self.faceIndices)
+        faceCount = len(self.faceIndices)
+
+        current = vertices[edges[:, 0]]
+        following = vertices[edges[:, 1]]
+
+        # Newell: sum over the edges of (y0 - y1)(z0 + z1), (z0 - z1)(x0 + x1), (x0 - x1)(y0 + y1)
+        terms = (np.roll(current, -1, axis=1) - np.roll(following, -1, axis=1)) * (np.roll(current, -2, axis=1) + np.roll(following, -2, axis=1))
+        normals = np.stack([np.bincount(faceOfEdge, weights=terms[:, axis], minlength=faceCount) for axis in range(3)], axis=1)
+
+        counts = np.bincount(faceOfEdge, minlength=faceCount)[:, None]
+        centers = np.stack([np.bincount(faceOfEdge, weights=current[:, axis], minlength=faceCount) for axis in range(3)], axis=1) / np.maximum(counts, 1)
+
+        inward = ((centers - vertices.mean(axis=0)) * normals).sum(axis=1) < 0
+        normals[inward] *= -1
+
+        return normals, centers
+
+    def __faceGeometryOfVersion(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.__faceGeometry is None or self.__faceGeometry[0] != self.geometryVersion:
+            self.__faceGeometry = (self.geometryVersion, *self.__computeFaceGeometry())
+
+        return self.__faceGeometry[1], self.__faceGeometry[2]
+
+    @property
+    def faceNormals(self) -> np.ndarray:
+        """ (F, 3) outward normals of the faces, only computed again after the vertices or faces change """
+        return self.__faceGeometryOfVersion()[0]
+
+    @property
+    def faceCenters(self) -> np.ndarray:
+        """ (F, 3) centers of the faces """
+        return self.__faceGeometryOfVersion()[1]
     
     def is3D(self) -> bool:
-        return self.__faces is not None
+        return self.getTopologyArray() is not None
     
     @property
     def lines3D(self) -> List[Line]:
         return self.__lines
 
     @property
-    def faces(self) -> list[int]:
-        return self.__faces
+    def faces(self) -> list[list[int]]:
+        faceIndices = self.faceIndices
+
+        if faceIndices is None:
+            return None
+
+        return [[index + 1 for index in face if index >= 0] for face in faceIndices.tolist()]
+
+    @property
+    def edgeIndices(self) -> np.ndarray | None:
+        """ (E, 2) array with the 0-based vertex indices of each unique edge of the faces """
+        return self.__edges
+
+    @property
+    def faceIndices(self) -> np.ndarray | None:
+        """ (F, K) array with the 0-based vertex indices of each face, padded with -1 """
+        return self.getTopologyArray()
     
     @property
     def filled(self) -> bool:
@@ -32,24 +173,14 @@ class WireFrame(SGIObject):
     @filled.setter
     def filled(self, value: bool) -> None:
         self.__filled = value
+        self.touch()
         
     def addPoint(self, point: Point) -> None:
-        self.__points.append(point)
-        
-    def getPositions(self) -> List[Position3D]:
-        return [x.position for x in self.__points]
-    
-    def setPositions(self, positions: List[Position3D]) -> None:
-        self.__points = []
-        
-        # For some reason, enumerate is not working here (changes order of or duplicates points in the wireframe)
-        for i, pos in enumerate(positions):
-            self.__points.append(Point(pos.axisX, pos.axisY, pos.axisZ, f'{self.name}_{i}'))
+        self.setPositionsArray(np.concatenate([self.getPositionsArray(), point.getPositionsArray()]))
         
     @property
     def centralPoint(self) -> Position3D:
-        x = sum([point.position.axisX for point in self.__points]) // len(self.__points)
-        y = sum([point.position.axisY for point in self.__points]) // len(self.__points)
-        z = sum([point.position.axisZ for point in self.__points]) // len(self.__points)
+        vertices = self.getPositionsArray()
+        x, y, z = (np.trunc(vertices).sum(axis=0) // len(vertices)).tolist()
         
         return Position3D(x, y, z)
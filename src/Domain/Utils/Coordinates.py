@@ -96,4 +96,18 @@ class Position3D:
         self.__axisZ += value
         
     def homogenous(self) -> np.ndarray:
-        return np.array([self.__axisX, self.__axisY, self.__axisZ, 1])
\ No newline at end of file
+        return np.array([self.__axisX, self.__axisY, self.__axisZ, 1])
+
+    @staticmethod
+    def toArray(positions: list['Position3D']) -> np.ndarray:
+        """
+        Packs the positions in a (N, 3) float64 array
+        """
+        return np.array([(p.__axisX, p.__axisY, p.__axisZ) for p in positions], dtype=np.float64).reshape(-1, 3)
+
+    @staticmethod
+    def fromArray(vertices: np.ndarray) -> list['Position3D']:
+        """
+        Unpacks a (N, 3) array in a list of positions
+        """
+        return [Position3D(x, y, z) for x, y, z in np.asarray(vertices).reshape(-1, 3).tolist()]
\ No newline at end of file
@@ -1,44 +1,235 @@
+import os
+from itertools import compress
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Shapes.Wireframe import WireFrame
-from Domain.Shapes.Point import Point
-from Domain.Utils.Enums import ObjectsTypes
+from Domain.Utils.MeshCache import MeshCache
+import numpy as np
+
+
+class GrowableArray:
+    """
+    Preallocated array that doubles its capacity when full, so appending N rows costs O(N) copies in total
+    """
+    def __init__(self, dtype: type, width: int = 1, capacity: int = 1024) -> None:
+        self.__width = width
+        self.__data = np.empty((capacity, width), dtype=dtype)
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def extend(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=self.__data.dtype).reshape(-1, self.__width)
+        required = self.__size + len(values)
+
+        if required > len(self.__data):
+            data = np.empty((max(required, 2 * len(self.__data)), self.__width), dtype=self.__data.dtype)
+            data[:self.__size] = self.__data[:self.__size]
+            self.__data = data
+
+        self.__data[self.__size:required] = values
+        self.__size = required
+
+    @property
+    def array(self) -> np.ndarray:
+        """ Used part of the buffer, without the spare capacity """
+        return self.__data[:self.__size]
+
 
 class DescriptorOBJ:
+    # Bytes read at a time, the peak memory of the reader is the chunk plus the arrays of the mesh
+    CHUNK_SIZE: int = 4 * 1024 * 1024
+
+    # Bytes that separate the tokens of a line
+    __BLANK = np.zeros(256, dtype=bool)
+    __BLANK[np.frombuffer(b" \t\r\n\v\f", dtype=np.uint8)] = True
+
     def __init__(self) -> None:
         pass
-    
+
     @staticmethod
-    def readOBJFile(file_path) -> WireFrame:
+    def readOBJFile(file_path, useCache: bool = True) -> WireFrame:
+        """
+        Loads the mesh from its binary cache when it is fresh, otherwise parses the OBJ and writes the cache
+        """
         if file_path[-4:] != ".obj":
             file_path += ".obj"
-        
-        file = open(file_path, "r")
-        lines = file.readlines()
-        name = ""
-        positions: list[Point] = []
-        
-        # Do nothing for now, will use later when 3D is needed
-        faces = []
-        
-        i_points = 0
-        
-        for line in lines:
-            if line[0] == "g":
-                name = ' '.join(line.split()[1:])
-            elif line[0] in ["v", "vt", "vn", "vp"]:
-                _, x, y, z = line.split()
-                positions.append(Point(float(x), float(y), float(z), f"{name}_{i_points}"))
-                i_points += 1
-            elif line[0] == "f":
-                faces.append([int(x) for x in line.split()[1::]])
-            elif line[0] == "a":
-                break
-        
+
+        cached = MeshCache.load(file_path) if useCache else None
+
+        if cached is not None:
+            header, arrays = cached
+            name, vertices, faces = header["name"], arrays["vertices"], arrays["faces"]
+            edges = (arrays["edges"], arrays["faceEdgeToEdge"])
+        else:
+            stat = os.stat(file_path)
+            digest = MeshCache.newDigest()
+
+            name, vertices, faces, groups = DescriptorOBJ.parseOBJFile(file_path, digest)
+            edges = WireFrame.topologyEdges(faces) if len(faces) > 0 else (np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.int64))
+
+            if useCache:
+                arrays = {"vertices": vertices, "faces": faces, "edges": edges[0], "faceEdgeToEdge": edges[1]}
+                MeshCache.save(file_path, stat, digest.hexdigest(), {"name": name, "groups": groups}, arrays)
+
+        if len(vertices) == 0:
+            raise ValueError(f"{file_path} has no vertices")
+
         if len(faces) > 0:
-            return WireFrame(name, positions, False, faces)
-        
-        return WireFrame(name, positions)
-    
+            return WireFrame(name, vertices, False, faces, edges=edges)
+
+        return WireFrame(name, vertices)
+
+    @staticmethod
+    def parseOBJFile(file_path, digest=None) -> tuple[str, np.ndarray, np.ndarray, list[tuple[str, int]]]:
+        """
+        Reads the OBJ in chunks, straight into NumPy arrays. Returns the name of the object, the (N, 3) vertices,
+        the (F, K) 0-based faces padded with -1 and the groups (o and g) as (name, first face).
+        Texture coordinates, normals, parameter vertices and any other statements are ignored.
+        The hashlib digest, if given, is updated with the bytes of the file
+        """
+        if file_path[-4:] != ".obj":
+            file_path += ".obj"
+
+        vertices = GrowableArray(np.float64, 3)
+        indices = GrowableArray(np.int64)
+        faceSizes = GrowableArray(np.int64)
+        groups: list[tuple[str, int]] = []
+
+        with open(file_path, "rb") as file:
+            for lines in DescriptorOBJ.__readLines(file, digest):
+                DescriptorOBJ.__parseLines(lines, vertices, indices, faceSizes, groups)
+
+        if np.any((indices.array < 0) | (indices.array >= len(vertices))):
+            raise ValueError(f"{file_path} has faces with vertices that do not exist")
+
+        name = groups[0][0] if len(groups) > 0 else os.path.splitext(os.path.basename(file_path))[0]
+
+        return name, vertices.array, DescriptorOBJ.__packFaces(indices.array[:, 0], faceSizes.array[:, 0]), groups
+
+    @staticmethod
+    def __readLines(file, digest=None):
+        """ Complete lines of each chunk, the unfinished last line is carried to the next one """
+        remainder = b""
+
+        while True:
+            chunk = file.read(DescriptorOBJ.CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            if digest is not None:
+                digest.update(chunk)
+
+            lines = (remainder + chunk).split(b"\n")
+            remainder = lines.pop()
+
+            yield DescriptorOBJ.__cleanLines(lines)
+
+        if remainder.strip():
+            yield DescriptorOBJ.__cleanLines([remainder])
+
+    @staticmethod
+    def __cleanLines(lines: list[bytes]) -> list[bytes]:
+        """ Lines without the comments, which go from # to the end of the line, and without the spaces around them """
+        if any(b"#" in line for line in lines):
+            return [line.split(b"#", 1)[0].strip() for line in lines]
+
+        return [line.strip() for line in lines]
+
+    @staticmethod
+    def __parseLines(lines: list[bytes], vertices: GrowableArray, indices: GrowableArray, faceSizes: GrowableArray, groups: list[tuple[str, int]]) -> None:
+        # Comments were cut, the empty lines fall out of every filter, line continuations are not supported
+        vertexLines = [i for i, line in enumerate(lines) if line[:2] in (b"v ", b"v\t")]
+        faceLines = [i for i, line in enumerate(lines) if line[:2] in (b"f ", b"f\t")]
+        groupLines = [i for i, line in enumerate(lines) if line[:2] in (b"o ", b"o\t", b"g ", b"g\t")]
+
+        vertexCount = len(vertices)
+        faceCount = len(faceSizes)
+
+        if len(vertexLines) > 0:
+            tokens, counts = DescriptorOBJ.__tokenize([lines[i] for i in vertexLines])
+
+            if np.any(counts < 3):
+                raise ValueError("OBJ vertex with less than 3 coordinates")
+
+            # Only x, y and z, the optional w and vertex colors are dropped
+            coordinates = np.array(tokens, dtype=np.float64)
+
+            if len(coordinates) != 3 * len(counts):
+                coordinates = coordinates[DescriptorOBJ.__positionInLine(counts) < 3]
+
+            vertices.extend(coordinates)
+
+        if len(faceLines) > 0:
+            tokens, sizes = DescriptorOBJ.__tokenize([lines[i] for i in faceLines], attributes=True)
+            faceIndices = np.array(tokens, dtype=np.int64)
+
+            if np.any(faceIndices == 0):
+                raise ValueError("OBJ face with index 0, the indices start at 1")
+
+            # Negative indices count back from the vertices read up to the line of the face
+            verticesBefore = vertexCount + np.searchsorted(vertexLines, faceLines)
+            faceIndices = np.where(faceIndices < 0, np.repeat(verticesBefore, sizes) + faceIndices, faceIndices - 1)
+
+            indices.extend(faceIndices)
+            faceSizes.extend(sizes)
+
+        for i in groupLines:
+            groupName = lines[i][2:].strip().decode("utf-8", errors="replace")
+            groups.append((groupName, faceCount + int(np.searchsorted(faceLines, i))))
+
+    @staticmethod
+    def __tokenize(lines: list[bytes], attributes: bool = False) -> tuple[list[bytes], np.ndarray]:
+        """
+        Tokens of all the lines without their keyword and the (L,) number of tokens of each line.
+        The block is split at once and the tokens are counted over its bytes instead of splitting every line.
+        With attributes only the first value of each v/vt/vn token is kept
+        """
+        # The lines are stripped, so the keyword is the first character and a separator
+        block = b"\n".join([line[2:] for line in lines])
+
+        characters = np.frombuffer(block, dtype=np.uint8)
+        blank = DescriptorOBJ.__BLANK[characters]
+
+        starts = ~blank
+        starts[1:] &= blank[:-1]
+
+        if attributes:
+            blank |= characters == ord("/")
+
+            # Every value is split, only the ones that start a whitespace token are kept
+            values = ~blank
+            values[1:] &= blank[:-1]
+
+            tokens = list(compress(block.replace(b"/", b" ").split(), starts[values]))
+            starts &= values
+        else:
+            tokens = block.split()
+
+        newLines = np.flatnonzero(characters == ord("\n"))
+        counts = np.bincount(np.searchsorted(newLines, np.flatnonzero(starts)), minlength=len(lines))
+
+        return tokens, counts
+
+    @staticmethod
+    def __positionInLine(counts: np.ndarray) -> np.ndarray:
+        """ Position of each token inside its line """
+        return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    @staticmethod
+    def __packFaces(indices: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """ (F, K) faces padded with -1, as WireFrame.packFaces does for the lists """
+        # Meshes of triangles or quads only need the indices reshaped
+        if len(sizes) > 0 and np.all(sizes == sizes[0]):
+            return indices.reshape(len(sizes), sizes[0])
+
+        packed = np.full((len(sizes), sizes.max(initial=0)), -1, dtype=np.int64)
+
+        packed[np.repeat(np.arange(len(sizes)), sizes), DescriptorOBJ.__positionInLine(sizes)] = indices
+
+        return packed
+
     @staticmethod
     def writeOBJFile(obj: SGIObject) -> None:
         with open(f"tests/{obj.name}.obj", "w") as file:
@@ -27,6 +27,8 @@ class RotationTypes(Enum):
 class ClippingMethods(Enum):
     LIANG = "Liang-Barsky"
     COHEN = "Cohen-Sutherland"
+    SUTHERLAND_HODGMAN = "Sutherland-Hodgman"
+    WEILER_ATHERTON = "Weiler-Atherton"
 
     @classmethod
     def convertFromString(cls, type_str: str) -> 'ClippingMethods':
@@ -36,6 +38,54 @@ class ClippingMethods(Enum):
             
         raise ValueError(f"No such enum member with value {type_str}")
     
+class ProjectionMethods(Enum):
+    PERSPECTIVE = "Perspectiva"
+    PARALLEL = "Paralela"
+
+    @classmethod
+    def convertFromString(cls, type_str: str) -> 'ProjectionMethods':
+        for enum_member in cls:
+            if enum_member.value == type_str:
+                return enum_member
+            
+        raise ValueError(f"No such enum member with value {type_str}")
+    
+class CullingMethods(Enum):
+    NONE = "Nenhum"
+    BACK_FACE = "Back-face"
+
+    @classmethod
+    def convertFromString(cls, type_str: str) -> 'CullingMethods':
+        for enum_member in cls:
+            if enum_member.value == type_str:
+                return enum_member
+            
+        raise ValueError(f"No such enum member with value {type_str}")
+    
+class TessellationMethods(Enum):
+    FIXED_STEP = "Passo fixo"
+    ADAPTIVE = "Adaptativa"
+
+    @classmethod
+    def convertFromString(cls, type_str: str) -> 'TessellationMethods':
+        for enum_member in cls:
+            if enum_member.value == type_str:
+                return enum_member
+            
+        raise ValueError(f"No such enum member with value {type_str}")
+    
+class SurfaceEvaluationMethods(Enum):
+    DIRECT = "Direta"
+    FORWARD_DIFFERENCES = "Diferenças adiante"
+
+    @classmethod
+    def convertFromString(cls, type_str: str) -> 'SurfaceEvaluationMethods':
+        for enum_member in cls:
+            if enum_member.value == type_str:
+                return enum_member
+            
+        raise ValueError(f"No such enum member with value {type_str}")
+    
 class CurvePlottingMethods(Enum):
     BSPLINE = "BSpline"
     BEZIER = "Bezier"
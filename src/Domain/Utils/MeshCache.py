@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+
+class MeshCache:
+    """
+    Binary sidecar of an imported mesh, a '<file>.cache' folder next to the source with one .npy per array
+    and a header.json with the size, modification time and hash of the source it was built from.
+
+    The arrays are opened with np.load(mmap_mode='r'), so loading only maps the files and the pages are read
+    when they are touched. The header is written last, a folder without it is never used
+    """
+    FORMAT_VERSION: int = 1
+    ARRAYS: tuple[str, ...] = ("vertices", "faces", "edges", "faceEdgeToEdge")
+
+    # Bytes hashed at a time
+    CHUNK_SIZE: int = 4 * 1024 * 1024
+
+    @staticmethod
+    def cachePath(sourcePath: str) -> str:
+        return sourcePath + ".cache"
+
+    @staticmethod
+    def newDigest():
+        return hashlib.blake2b(digest_size=20)
+
+    @staticmethod
+    def hashFile(sourcePath: str) -> str:
+        digest = MeshCache.newDigest()
+
+        with open(sourcePath, "rb") as file:
+            while chunk := file.read(MeshCache.CHUNK_SIZE):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def load(sourcePath: str) -> tuple[dict, dict[str, np.ndarray]] | None:
+        """
+        Header and memory mapped arrays of the cache, None when there is no cache or it is stale.
+        A source with another modification time but the same size is hashed, so a touched file keeps its cache
+        """
+        folder = MeshCache.cachePath(sourcePath)
+        headerPath = os.path.join(folder, "header.json")
+
+        try:
+            with open(headerPath, "r") as file:
+                header = json.load(file)
+
+            stat = os.stat(sourcePath)
+        except (OSError, ValueError):
+            return None
+
+        if header.get("formatVersion") != MeshCache.FORMAT_VERSION or header.get("size") != stat.st_size:
+            return None
+
+        if header.get("mtime") != stat.st_mtime_ns:
+            if MeshCache.hashFile(sourcePath) != header.get("hash"):
+                return None
+
+            header["mtime"] = stat.st_mtime_ns
+
+            # A read only folder still serves the cache, it is only hashed again next time
+            try:
+                MeshCache.__writeHeader(folder, header)
+            except OSError:
+                pass
+
+        try:
+            arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode='r') for name in MeshCache.ARRAYS}
+        except (OSError, ValueError):
+            return None
+
+        return header, arrays
+
+    @staticmethod
+    def save(sourcePath: str, stat: os.stat_result, sourceHash: str, header: dict, arrays: dict[str, np.ndarray]) -> bool:
+        """
+        Writes the arrays and the header of the source. The stat must be taken before the source is read,
+        so a file changed while it was parsed is seen as stale. Returns False when the folder can not be written
+        """
+        folder = MeshCache.cachePath(sourcePath)
+        headerPath = os.path.join(folder, "header.json")
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+
+            # Without the header the folder is ignored while the arrays are replaced
+            if os.path.exists(headerPath):
+                os.remove(headerPath)
+
+            # Written aside and renamed, the arrays of meshes already loaded keep mapping the old files
+            for name in MeshCache.ARRAYS:
+                arrayPath = os.path.join(folder, f"{name}.npy")
+
+                with open(arrayPath + ".tmp", "wb") as file:
+                    np.save(file, np.ascontiguousarray(arrays[name]))
+
+                os.replace(arrayPath + ".tmp", arrayPath)
+
+            MeshCache.__writeHeader(folder, {**header, "formatVersion": MeshCache.FORMAT_VERSION, "size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": sourceHash})
+        except OSError as error:
+            print(f"Cache da malha não foi salvo em {folder}: {error}")
+            return False
+
+        return True
+
+    @staticmethod
+    def __writeHeader(folder: str, header: dict) -> None:
+        temporaryPath = os.path.join(folder, "header.json.tmp")
+
+        with open(temporaryPath, "w") as file:
+            json.dump(header, file)
+
+        os.replace(temporaryPath, os.path.join(folder, "header.json"))
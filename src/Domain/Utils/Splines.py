@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class Splines:
+    """
+    Basis matrices of the cubic splines, written for the power basis [t^3, t^2, t, 1],
+    and the sample tables shared by the curves and the surfaces
+    """
+    BEZIER_MATRIX = np.array([
+        [-1, 3, -3, 1],
+        [3, -6, 3, 0],
+        [-3, 3, 0, 0],
+        [1, 0, 0, 0]
+    ])
+
+    BSPLINE_MATRIX = np.array([
+        [-1 / 6, 1 / 2, -1 / 2, 1 / 6],
+        [1 / 2, -1, 1 / 2, 0],
+        [-1 / 2, 0, 1 / 2, 0],
+        [1 / 6, 2 / 3, 1 / 6, 0],
+    ])
+
+    HERMITE_MATRIX = np.array([
+        [2, -2, 1, 1],
+        [-3, 3, -2, -1],
+        [0, 0, 1, 0],
+        [1, 0, 0, 0]
+    ])
+
+    # B-spline geometry -> Bezier control points of the same segment
+    BSPLINE_TO_BEZIER_MATRIX = np.array([
+        [1, 4, 1, 0],
+        [0, 4, 2, 0],
+        [0, 2, 4, 0],
+        [0, 1, 4, 1]
+    ]) / 6
+
+    # Basis matrix bytes -> matrix taking the geometry of that basis to Bezier control points
+    __bezierConversions: dict[bytes, np.ndarray] = {}
+
+    # Step -> (S, 4) table with [t^3, t^2, t, 1] for each sample t
+    __powerBasis: dict[float, np.ndarray] = {}
+
+    @staticmethod
+    def clampStep(step: float) -> float:
+        if step <= 0:
+            return 0.01
+        elif step > 1:
+            return 1
+
+        return step
+
+    @classmethod
+    def powerBasis(cls, step: float) -> np.ndarray:
+        """
+        (S, 4) power basis of the samples t = 0, step, 2 * step, ... < 1 and t = 1, built once per step.
+        The last sample is always 1, even when the step does not divide 1, so the segments and patches end on their borders
+        """
+        step = cls.clampStep(step)
+        basis = cls.__powerBasis.get(step)
+
+        if basis is None:
+            t = np.append(np.arange(int(np.ceil(1 / step - 1e-9))) * step, 1.0)
+
+            basis = np.stack([t**3, t**2, t, np.ones_like(t)], axis=1)
+            basis.setflags(write=False)
+
+            cls.__powerBasis[step] = basis
+
+        return basis
+
+    @classmethod
+    def toBezierMatrix(cls, basisMatrix: np.ndarray) -> np.ndarray:
+        """
+        Change of basis to Bezier, M_bezier^-1 M: both describe the same cubic when M_bezier B = M G,
+        so it works for any cubic basis, the B-spline one gives BSPLINE_TO_BEZIER_MATRIX
+        """
+        key = np.asarray(basisMatrix, dtype=np.float64).tobytes()
+        conversion = cls.__bezierConversions.get(key)
+
+        if conversion is None:
+            conversion = np.linalg.solve(cls.BEZIER_MATRIX, basisMatrix)
+            conversion.setflags(write=False)
+
+            cls.__bezierConversions[key] = conversion
+
+        return conversion
@@ -1,9 +1,12 @@
 from Domain.Utils.Coordinates import Position3D
 from Domain.Utils.Enums import RotationTypes
+from Domain.Shapes.SGIObject import SGIObject
 from abc import ABC, abstractmethod
 import numpy as np
 
 class Transform(ABC):
+    MIN_W: float = 1e-6
+
     def __init__(self, positions: list[Position3D] = []) -> None:
         self.__positions = positions
 
@@ -11,26 +14,6 @@ class Transform(ABC):
     def getName(self) -> str:
         pass
 
-    def __do_transform(self, position: Position3D) -> np.ndarray:
-        
-        pos = position.homogenous()
-        
-        #print(f"Position: {pos}, shape: {pos.shape}")
-        
-        matrix = self.matrix()
-        
-        #print(f"Matrix: {matrix}, shape: {matrix.shape}")
-        #print(f"Element types: {matrix.dtype}")
-        
-        result = matrix @ pos 
-        
-        #print(f"Result: {result}, shape: {result.shape}")
-        
-        return result
-    
-    def __matrix_homogenous_to_position(self, positions: np.ndarray) -> Position3D:
-        return Position3D(np.round(positions[0]), np.round(positions[1]), np.round(positions[2]))
-    
     @abstractmethod
     def matrix(self) -> np.ndarray:
         return Transform.identity()
@@ -43,14 +26,53 @@ class Transform(ABC):
                             [0, 0, 0, 1]])
         
         
-    def execute(self) -> list[Position3D]:
-        l = []
+    @staticmethod
+    def homogeneous(vertices: np.ndarray) -> np.ndarray:
+        """
+        Converts a (N, 3) array of vertices to a (N, 4) array of homogeneous coordinates
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
         
-        for position in self.__positions:
-            pos = self.__matrix_homogenous_to_position(self.__do_transform(position))
-            l.append(pos)
+        return np.hstack([vertices, np.ones((len(vertices), 1))])
+    
+    def apply(self, vertices: np.ndarray | SGIObject, rounded: bool = True) -> np.ndarray:
+        """
+        Applies the matrix to a whole batch of vertices in a single product.
+        Accepts a (N, 3) or (N, 4) array, or an object whose positions are used, and returns a (N, 3) array
+        """
+        if isinstance(vertices, SGIObject):
+            vertices = vertices.getPositionsArray()
+        
+        vertices = np.asarray(vertices, dtype=np.float64)
+        
+        if vertices.shape[-1] == 3:
+            vertices = Transform.homogeneous(vertices)
+        
+        # Row vectors: (M @ p.T).T == p @ M.T
+        result = (vertices @ self.matrix().T)[:, :3]
+        
+        if rounded:
+            result = np.round(result)
+        
+        return result
+        
+    def project(self, vertices: np.ndarray) -> np.ndarray:
+        """
+        Applies the matrix to a (N, 3) or (N, 4) batch of vertices followed by the homogeneous divide, returns a (N, 3) array.
+        Vertices at or behind the center of projection (w <= 0) are pushed to a tiny positive w
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+
+        if vertices.shape[-1] == 3:
+            vertices = Transform.homogeneous(vertices)
+
+        homogeneous = vertices @ self.matrix().T
+        w = np.maximum(homogeneous[:, 3:], Transform.MIN_W)
         
-        return l
+        return homogeneous[:, :3] / w
+    
+    def execute(self) -> list[Position3D]:
+        return Position3D.fromArray(self.apply(Position3D.toArray(self.__positions)))
     
     def set_positions(self, positions: list[Position3D]) -> None:
         self.__positions = positions
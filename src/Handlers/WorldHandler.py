@@ -1,8 +1,6 @@
 from Domain.Management.Viewport import ViewPort
 from Domain.Management.Window import Window
 from Domain.Management.World import World
-from Domain.Utils.Enums import RotationTypes
-from Domain.Utils.Transforms import GenericTransform, Rotation, Translation
 from Handlers.WorldObjectsHandler import WorldObjectsHandler
 from Domain.Utils.Constants import Constants
 
@@ -36,32 +34,9 @@ class WorldHandler:
         return self.__viewport
 
     def rotateWindow(self, angle: float, axis: str) -> None:
-        window_positions = self.__window.getPositions()
-
-        windowTranslationTransform = Translation(-self.__window.centralPoint.axisX, -self.__window.centralPoint.axisY, -self.__window.centralPoint.axisZ)
-        windowRotationTransform = Rotation(angle, RotationTypes.CENTER_OBJECT, axis=axis)
-        windowBackTranslationTransform = Translation(self.__window.centralPoint.axisX, self.__window.centralPoint.axisY, self.__window.centralPoint.axisZ)
-        
-        finalTransform = GenericTransform(positions=window_positions)
-        finalTransform.add_transforms([windowTranslationTransform, windowRotationTransform, windowBackTranslationTransform])
-        
-        finalPositions = finalTransform.execute()
-        self.__window.setPositions(finalPositions)
-        newAngle = (self.__window.angles[axis] + angle) % 360
-        self.__window.setAngle(newAngle, axis)
-        print(f"Window angle {axis}: {newAngle}")
+        # Only the camera changes, the objects of the world keep their positions
+        self.__window.rotate(angle, axis)
+        print(f"Window angle {axis}: {self.__window.angles[axis]}")
 
         self.__window.printPositions()
         self.__window.dimensions.printDimensions()
-        self.__window.recalculateDimensionsWithPositions()
-        
-        # Transform the objects of the world
-        for obj in self.__world.objects:
-            transform = GenericTransform(positions=obj.getPositions())
-            
-            rotation = Rotation(-angle, RotationTypes.CENTER_OBJECT, axis=axis)
-                       
-            transform.add_transforms([windowTranslationTransform, rotation, windowBackTranslationTransform])
-            obj.setPositions(transform.execute())
-        
-        
\ No newline at end of file
@@ -1,4 +1,4 @@
-from copy import copy, deepcopy
+from copy import copy
 import math
 from typing import List
 from Domain.Management.CurvesPlotting import CurvesPlotter
@@ -12,74 +12,102 @@ from Domain.Shapes.Wireframe import WireFrame
 from Domain.Shapes.Surface import Surface
 from Domain.Shapes.SGIObject import SGIObject
 from Domain.Utils.Coordinates import Position3D
-from Domain.Utils.Transforms import Translation, Rotation, GenericTransform
-from Domain.Utils.Enums import ClippingMethods, ObjectsTypes, RotationTypes, CurvePlottingMethods
-from Domain.Management.Clipping import Clipper, CohenSutherlandStrategy, LiangBarskyStrategy
+from Domain.Utils.Transforms import Transform, Translation, Rotation, GenericTransform
+from Domain.Utils.Enums import ClippingMethods, CullingMethods, ProjectionMethods, TessellationMethods, SurfaceEvaluationMethods, ObjectsTypes, RotationTypes, CurvePlottingMethods
+from Domain.Management.RenderProxy import RenderProxy
+from Domain.Management.TessellationCache import TessellationCache
+from Domain.Management.Clipping import Clipper, CohenSutherlandStrategy, LiangBarskyStrategy, SutherlandHodgmanStrategy, WeilerAthertonStrategy, ViewVolumeClipper
 from Domain.Utils.Constants import Constants
 import numpy as np
 
 
 class WorldObjectsHandler:
+    # Largest distance, in pixels of the viewport, between an adaptive curve and its polyline
+    CURVE_TOLERANCE_PIXELS: float = 0.5
+
     def __init__(self, viewPort: ViewPort, window: Window, world: World) -> None:
         self.__window: Window = window
         self.__world: World = world
         self.__tempWireframePoints: List[Point] = []
         self.__tempCurvePoints: List[Point] = []
         self.__clipper = Clipper()
-        self.__debugWindowPos = []
+        self.__cullingMethod = CullingMethods.NONE
+        self.__tessellationCache = TessellationCache()
+        self.__tessellationMethod = TessellationMethods.FIXED_STEP
+        self.__surfaceEvaluationMethod = SurfaceEvaluationMethods.DIRECT
+
+        # Object id -> (object version, camera key, proxy in viewport coordinates or None when clipped out)
+        self.__viewPortCache: dict[int, tuple[int, int, RenderProxy | None]] = {}
 
     def setClippingMethod(self, clippingMethod: ClippingMethods) -> None:
         if clippingMethod == ClippingMethods.COHEN:
             self.__clipper.setLineClippingStrategy(CohenSutherlandStrategy())
         elif clippingMethod == ClippingMethods.LIANG:
             self.__clipper.setLineClippingStrategy(LiangBarskyStrategy())
+        elif clippingMethod == ClippingMethods.SUTHERLAND_HODGMAN:
+            self.__clipper.setPolygonClippingStrategy(SutherlandHodgmanStrategy())
+        elif clippingMethod == ClippingMethods.WEILER_ATHERTON:
+            self.__clipper.setPolygonClippingStrategy(WeilerAthertonStrategy())
         else:
             print('Clipping method não encontrado')
 
+        self.__viewPortCache.clear()
+
+    def setCullingMethod(self, cullingMethod: CullingMethods) -> None:
+        print(f'Culling: {cullingMethod.value}')
+
+        self.__cullingMethod = cullingMethod
+        self.__viewPortCache.clear()
+
+    def setTessellationMethod(self, tessellationMethod: TessellationMethods) -> None:
+        print(f'Tesselação: {tessellationMethod.value}')
+
+        self.__tessellationMethod = tessellationMethod
+        self.__viewPortCache.clear()
+
+    def setSurfaceEvaluationMethod(self, surfaceEvaluationMethod: SurfaceEvaluationMethods) -> None:
+        print(f'Avaliação das superfícies: {surfaceEvaluationMethod.value}')
+
+        self.__surfaceEvaluationMethod = surfaceEvaluationMethod
+        self.__viewPortCache.clear()
+
     @property
     def windowPositionsPPC(self) -> List[Position3D]:
-        arr = []
-        
-        for position in self.__debugWindowPos:
-            arr.append(self.__transformPositionToViewPort(position, self.__debugWindowPos))
-            
-        for position in arr:
-            position.axisX += Constants.VIEWPORT_SLACK // 2
-            position.axisY += Constants.VIEWPORT_SLACK // 2
-            
-        return arr
+        windowPositions = Position3D.toArray(self.__window.positionsPPC)
+
+        return Position3D.fromArray(self.__toViewPort(windowPositions))
     
     @property
     def windowCenterPPC(self) -> Position3D:
-        x_center = sum([p.axisX for p in self.__debugWindowPos]) / 4
-        y_center = sum([p.axisY for p in self.__debugWindowPos]) / 4
-        z_center = sum([p.axisZ for p in self.__debugWindowPos]) / 4
-        
-        return self.__transformPositionToViewPort(Position3D(x_center, y_center, z_center), self.__debugWindowPos)
-
-    def __convertWorldPositionToPpcAndViewport(self, positionPPC: Position3D) -> Position3D: 
-        # Creates a point to follow the method interface
-        point = Point(positionPPC.axisX, positionPPC.axisY, positionPPC.axisZ)
-
-        # Convert to PPC
-        windowPositions, objectsConvertedToPPC = self.__convertObjectToPPC([point], self.__window.getPositions())
-
-        # Extract the position again
-        positionPPC = objectsConvertedToPPC[0].position
-
-        # Convert to Viewport
-        positionVP = self.__transformPositionToViewPort(positionPPC, windowPositions)
+        windowCenter = Position3D.toArray(self.__window.positionsPPC).mean(axis=0, keepdims=True)
 
-        return positionVP 
+        return Position3D.fromArray(self.__toViewPort(windowCenter))[0]
     
     @property
     def worldCenterPPC(self) -> Position3D:
-        worldCenterPoint = Position3D(0, 0, 0)
+        worldCenter = np.zeros((1, 3))
 
-        return self.__convertWorldPositionToPpcAndViewport(worldCenterPoint)
+        return Position3D.fromArray(np.round(GenericTransform(matrix=self.__window.worldToViewportMatrix).project(worldCenter)))[0]
     
     def addObject(self, obj: SGIObject) -> None:
         self.__world.addObject(obj)
+
+    def addObjects(self, objs: List[SGIObject]) -> None:
+        self.__world.addObjects(objs)
+
+    def removeObjectById(self, objectId: int) -> None:
+        self.__world.removeObjectById(objectId)
+        self.__tessellationCache.discard(objectId)
+
+    def removeObjectsByIds(self, objectIds: List[int]) -> None:
+        self.__world.removeObjectsByIds(objectIds)
+
+        for objectId in objectIds:
+            self.__tessellationCache.discard(objectId)
+
+    @property
+    def tessellationCache(self) -> TessellationCache:
+        return self.__tessellationCache
     
     def addLine(self, pointOne: Position3D, pointTwo: Position3D, name: str = "Linha", color: tuple[int, int, int] = (0, 0, 0)) -> None:
         line = Line(pointOne, pointTwo, name)
@@ -95,10 +123,16 @@ class WorldObjectsHandler:
 
         self.__world.addObject(point)
         
-    def addSurface(self, positions: List[Position3D], name: str = 'Superfície', color: tuple[int, int, int] = (0, 0, 0), fill: bool = False) -> None:
+    def addSurface(self, positions: List[Position3D], name: str = 'Superfície', color: tuple[int, int, int] = (0, 0, 0), fill: bool = False, strategy: CurvePlottingMethods = CurvePlottingMethods.BEZIER, columns: int = None) -> None:
+        rows = len(positions) // columns if columns else int(round(len(positions) ** 0.5))
+
+        if Surface.patchCount(rows, columns or rows, strategy) == (0, 0) or rows * (columns or rows) != len(positions):
+            print(f'Superfície {strategy.value} precisa de uma malha de controle válida, recebeu {len(positions)} pontos')
+            return
+
         print(f'Superfície adicionada {name} com {len(positions)} pontos. Fill: {fill}')
         
-        surface = Surface(name, [Point.fromPosition(p) for p in positions], fill)
+        surface = Surface(name, [Point.fromPosition(p) for p in positions], fill, strategy, columns)
         surface.setColor(color)
         
         self.__world.addObject(surface)
@@ -141,235 +175,206 @@ class WorldObjectsHandler:
         
         self.__tempWireframePoints.clear()
     
-    def __perspectiveProjection(self, inputObjects: List[SGIObject]) -> tuple[List[Position3D], List[SGIObject]]:
-        # Get the left bottom and left up positions from Window
-        windowPositions = deepcopy(self.__window.getPositions())
-        objectToConvert = deepcopy(inputObjects)
-        
-        # Get COP
-        cop = self.__window.getCOP()
-        
-        toOrigin = Translation(-cop.axisX, -cop.axisY, -cop.axisZ)
-        operations = [toOrigin]
-        
-        newWindowPositions = Translation(-cop.axisX, -cop.axisY, -cop.axisZ, windowPositions).execute()
-        
-        x = self.__window.dimensions.length / 2 + cop.axisX
-        y = self.__window.dimensions.width / 2 + cop.axisY
-        d = 1000
-        perspectiveMatrix = np.asarray([
-            [1, 0, -x/d, 0],
-            [0, 1, -y/d, 0],
-            [0, 0, 0, 0],
-            [0, 0, -1/d, 1]
-        ])
-        
-        print(f"Perspective matrix: {perspectiveMatrix}")
-        perspectiveTransform = GenericTransform(matrix=perspectiveMatrix)
-        operations.append(perspectiveTransform)
-        
-        # Apply the transform to a copy of each object
-        transformedObjects: List[SGIObject] = []
-        for obj in objectToConvert:
-            objPositions = obj.getPositions()
-            
-            # Calculate the points for this curve
-            if (obj.type == ObjectsTypes.CURVE):
-                objPositions = CurvesPlotter.generatePoints(obj, 0.1)
-            elif (obj.type == ObjectsTypes.SURFACE):
-                objPositions = obj.generatePositions(0.1)
-            
-            
-            finalTransform = GenericTransform(positions=objPositions)
-            finalTransform.add_transforms(operations)
-            #print("Final Perspective transform: ", finalTransform.matrix())
-            
-            objFinalPositions = finalTransform.execute()
-            
-            objCopy = deepcopy(obj)
-            objCopy.setPositions(objFinalPositions)
-            
-            transformedObjects.append(objCopy)
-            
-        return newWindowPositions, transformedObjects
-    
-    def __parallelProjection(self, inputObjects: List[SGIObject]) -> tuple[List[Position3D], List[SGIObject]]:
-        # Get the left bottom and left up positions from Window
-        windowPositions = deepcopy(self.__window.getPositions())
-       
-        objectToConvert = deepcopy(inputObjects)
-        
-        # VPR to origin
-        toOrigin = Translation(-self.__window.centralPoint.axisX, -self.__window.centralPoint.axisY, -self.__window.centralPoint.axisZ)
-        
-        operations = [toOrigin]
-        
-        # Get VPN
-        vpn = Window.getVPN(windowPositions)
-        
-        # Angle between vpn, x and y
-        alpha = np.pi / 2 - np.arccos(np.clip(np.dot(vpn, [1, 0, 0]), -1, 1))
-        beta = np.pi / 2 - np.arccos(np.clip(np.dot(vpn, [0, 1, 0]), -1, 1))
-        
-        alpha = np.degrees(alpha)
-        beta = np.degrees(beta)
-        
-        #print(f"Window angles: {self.__window.angles}")
-        #print(f"Alpha: {alpha}, Beta: {beta}")
-        
-        rotateX, rotateY = None, None
-        if alpha != 0:
-            rotateX = Rotation(-alpha, RotationTypes.CENTER_WORLD, axis="X")
-            operations.append(rotateX)
-        
-        if beta != 0:
-            rotateY = Rotation(-beta, RotationTypes.CENTER_WORLD, axis="Y")
-            operations.append(rotateY)
-        
-        windowTransform = GenericTransform(positions=windowPositions)
-        windowTransform.add_transforms([toOrigin])
-        newWindowPositions = windowTransform.execute()
-        
-        # Apply the transform to a copy of each object
-        transformedObjects: List[SGIObject] = []
-        for obj in objectToConvert:
-            objPositions = obj.getPositions()
-            
-            # Calculate the points for this curve
-            if (obj.type == ObjectsTypes.CURVE):
-                objPositions = CurvesPlotter.generatePoints(obj, 0.1)
-            elif (obj.type == ObjectsTypes.SURFACE):
-                objPositions = obj.generatePositions(0.1)
-                print(f"Object {obj.name} has {len(objPositions)} points")
-                print([f"{p.axisX}, {p.axisY}, {p.axisZ}" for p in objPositions])
-            finalTransform = GenericTransform(positions=objPositions)
-            finalTransform.add_transforms(operations)
-            
-            objFinalPositions = finalTransform.execute()
-            objFinalPositions = [Position3D(p.axisX, p.axisY, 0) for p in objFinalPositions]
-            
-            objCopy = deepcopy(obj)
-            objCopy.setPositions(objFinalPositions)
-            
-            transformedObjects.append(objCopy)
-            
-        return newWindowPositions, transformedObjects
-         
-    def __convertObjectToPPC(self, inputObjects: List[SGIObject], windowPos: List[Position3D]) -> tuple[Position3D, list[SGIObject]]:
-        # Get the left bottom and left up positions from Window
-        windowPositions = deepcopy(windowPos)
-        
-        x_center = sum([p.axisX for p in windowPositions]) / 4
-        y_center = sum([p.axisY for p in windowPositions]) / 4
-        z_center = sum([p.axisZ for p in windowPositions]) / 4
-       
-        objectToConvert = deepcopy(inputObjects)
-        
-        # Apply the transform to a copy of each object
-        transformedObjects: List[SGIObject] = []
-        for obj in objectToConvert:
-            objPositions = obj.getPositions()
-            
-            # Translate object 
-            translateTransform = Translation(-x_center, -y_center, -z_center, objPositions)
+    def __objectGeometry(self, obj: SGIObject) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        Vertices to project and the (E, 2) edges between them when they are not the ones of the object,
+        like the grid of a surface or the front edges of a mesh
+        """
+        # Curves and surfaces are only tessellated again after their control points change
+        if (obj.type == ObjectsTypes.CURVE):
+            if self.__tessellationMethod == TessellationMethods.ADAPTIVE:
+                return self.__adaptiveCurveVertices(obj), None
+
+            # The curve keeps its own buffer per segment, copying it into the cache would cost the whole curve per edit
+            return CurvesPlotter.generatePoints(obj, 0.1), None
+        elif (obj.type == ObjectsTypes.SURFACE):
+            method = self.__surfaceEvaluationMethod
+            grid = self.__tessellationCache.getOrGenerate(obj.id, obj.geometryVersion, (obj.strategy, method), 0.1, lambda: obj.generateGrid(0.1, method)[0])
+
+            return grid.reshape(-1, 3), Surface.gridEdges(grid.shape[0], grid.shape[1])
+        elif self.__cullingMethod == CullingMethods.BACK_FACE:
+            return obj.getPositionsArray(), self.__frontEdges(obj)
+        
+        return obj.getPositionsArray(), None
+
+    def __adaptiveCurveVertices(self, curve: Curve) -> np.ndarray:
+        """
+        Curve subdivided until flat within CURVE_TOLERANCE_PIXELS on the viewport. The tolerance is taken to the world
+        with the pixels per unit of the window. In the perspective a unit at the distance z from the COP is d / z times
+        the one on the plane of the window, the nearest control point is used since the curve is inside their hull.
+        The scale is rounded up to a power of sqrt(2), so moving and rotating the camera or small zooms
+        keep using the cached points
+        """
+        pixelsPerUnit = Constants.VIEWPORT_LENGTH / self.__window.dimensions.length
+
+        if self.__window.projectionMethod == ProjectionMethods.PERSPECTIVE:
+            depths = (curve.getPositionsArray() - Position3D.toArray([self.__window.getCOP()])) @ self.__window.orientation[:, 2]
+            nearest = max(float(depths.min()), Window.NEAR_DISTANCE)
+
+            pixelsPerUnit *= Window.PROJECTION_DISTANCE / nearest
+
+        level = math.ceil(2 * math.log2(pixelsPerUnit))
+        tolerance = self.CURVE_TOLERANCE_PIXELS / 2 ** (level / 2)
+
+        return self.__tessellationCache.getOrGenerate(curve.id, curve.geometryVersion, curve.strategy, ('adaptive', level), lambda: CurvesPlotter.generateAdaptivePoints(curve, tolerance))
+
+    def __projectObjects(self, inputObjects: List[SGIObject]) -> List[RenderProxy]:
+        """
+        Projects the vertices of all objects to PPC at once: one (N, 4) @ (4, 4) product over the concatenated
+        vertices followed by the homogeneous divide, then each render proxy takes a view of its slice by offset.
+        The perspective and parallel projections only differ by the matrix cached in the window.
+
+        Before the divide the objects are tested against the planes of the view volume: the ones completely outside
+        of a plane, like the objects behind the camera, are dropped, and the ones crossing the near or far planes
+        are clipped in homogeneous coordinates, the others are left to the clipping in PPC
+        """
+        objectsGeometry = [self.__objectGeometry(obj) for obj in inputObjects]
+
+        # Objects without vertices have nothing to draw
+        inputObjects = [obj for obj, (vertices, _) in zip(inputObjects, objectsGeometry) if len(vertices) > 0]
+        objectsGeometry = [geometry for geometry in objectsGeometry if len(geometry[0]) > 0]
+        objectsVertices = [vertices for vertices, _ in objectsGeometry]
+
+        if len(inputObjects) == 0:
+            return []
+
+        lengths = np.array([len(vertices) for vertices in objectsVertices])
+        offsets = np.cumsum(np.concatenate([[0], lengths]))
+
+        vertices = Transform.homogeneous(np.concatenate(objectsVertices))
+        planes = self.__window.clipPlanes
+
+        distances = vertices @ planes.T
+        minDistances = np.minimum.reduceat(distances, offsets[:-1], axis=0)
+        maxDistances = np.maximum.reduceat(distances, offsets[:-1], axis=0)
+
+        culled = (maxDistances < 0).any(axis=1)
+        crossesDepth = (minDistances[:, 4:] < 0).any(axis=1) & ~culled
+        direct = ~culled & ~crossesDepth
+
+        projection = GenericTransform(matrix=self.__window.projectionMatrix)
+
+        # Only the vertices of the objects that are not culled nor clipped in 3D are divided here
+        projected = projection.project(vertices[np.repeat(direct, lengths)])
+        projectedOffsets = np.cumsum(np.concatenate([[0], lengths * direct]))
+
+        proxies: List[RenderProxy] = []
+
+        for index, obj in enumerate(inputObjects):
+            edges = objectsGeometry[index][1]
+
+            if direct[index]:
+                proxies.append(RenderProxy(obj, projected[projectedOffsets[index]:projectedOffsets[index + 1]], edges=edges))
+
+            elif crossesDepth[index]:
+                proxy = self.__clipViewVolume(obj, vertices[offsets[index]:offsets[index + 1]], planes, projection, edges)
+
+                if proxy is not None:
+                    proxies.append(proxy)
+
+        return proxies
+
+    def __frontEdges(self, obj: SGIObject) -> np.ndarray | None:
+        """
+        Edges of the faces of a 3D wireframe turned to the camera, with a single dot product over all faces.
+        None for the other objects, all their segments are drawn
+        """
+        if obj.type != ObjectsTypes.WIREFRAME or not obj.is3D():
+            return None
 
-            # Execute the matrix calculus
-            objFinalPositions = translateTransform.execute()
+        if self.__window.projectionMethod == ProjectionMethods.PERSPECTIVE:
+            toCamera = Position3D.toArray([self.__window.getCOP()]) - obj.faceCenters
+        else:
+            # In the parallel projection the camera looks along the normal of the window
+            toCamera = -self.__window.orientation[:, 2]
 
-            # Create a new object with the new positions and add to the list
-            objCopy = deepcopy(obj)
-            objCopy.setPositions(objFinalPositions)
+        front = (obj.faceNormals * toCamera).sum(axis=1) >= 0
 
-            transformedObjects.append(objCopy)
+        return obj.edgesOfFaces(front)
 
-        # Translate the window
-        translateWindowTransform = Translation(-x_center, -y_center, -z_center, windowPositions)
+    def __clipViewVolume(self, obj: SGIObject, vertices: np.ndarray, planes: np.ndarray, projection: GenericTransform, edges: np.ndarray | None = None) -> RenderProxy | None:
+        """ Clips the (N, 4) homogeneous vertices of an object crossing the near or far planes, then divides them """
+        if Clipper.isPolygon(obj):
+            clipped = ViewVolumeClipper.clipPolygon(vertices, planes[4:])
 
-        newWindowsPositions = translateWindowTransform.execute()
+            return None if len(clipped) == 0 else RenderProxy(obj, projection.project(clipped))
 
-        # Rotate the window
-        rotations = [Rotation(-angle, RotationTypes.CENTER_WORLD, axis=axis) for axis, angle in self.__window.angles.items()]
-        rotateWindowTransform = GenericTransform(positions=newWindowsPositions)
+        segments = vertices[Clipper.segmentIndices(obj, len(vertices)) if edges is None else edges]
+        clipped, keep = ViewVolumeClipper.clipSegments(segments, planes)
 
-        rotateWindowTransform.add_transforms(rotations)
-        newWindowsPositions = rotateWindowTransform.execute()
+        if not keep.any():
+            return None
 
-        # Return new window matrix and transformed objects
-        return newWindowsPositions, transformedObjects
+        lines = projection.project(clipped[keep].reshape(-1, 4)).reshape(-1, 2, 3)
 
-    def __transformPositionToViewPort(self, position: Position3D, window_pos: Position3D) -> Position3D:
-        xW = position.axisX
+        return RenderProxy(obj, lines.reshape(-1, 3), lines, edges)
 
-        xVP = ((xW - window_pos[0].axisX) / (self.__window.dimensions.length)) * (Constants.VIEWPORT_LENGTH)
+    def __toViewPort(self, positions: np.ndarray) -> np.ndarray:
+        """ PPC -> normalized -> viewport with a single matrix """
+        return GenericTransform(matrix=self.__window.ppcToViewportMatrix).apply(positions)
 
-        yW = position.axisY
+    def __visibleObjects(self) -> List[SGIObject]:
+        """
+        Objects of the world whose bounding box may be projected inside the window, found in the spatial index
+        """
+        # One unit of margin, the clipping works over truncated coordinates
+        windowArray = Position3D.toArray(self.__window.positionsPPC)
+        rectMin = windowArray[:, :2].min(axis=0) - 1
+        rectMax = windowArray[:, :2].max(axis=0) + 1
 
-        yVP = (1 - ((yW - window_pos[0].axisY) / (self.__window.dimensions.width))) * (Constants.VIEWPORT_WIDTH)
-        
-        pointTransformed = Position3D(round(xVP), round(yVP), 1)
+        return self.__world.queryView(self.__window.projectionMatrix, rectMin, rectMax)
 
-        return pointTransformed
+    def __proxyToViewPort(self, proxy: RenderProxy) -> RenderProxy:
+        print(f"Object {proxy.name} has {len(proxy.getPositionsArray())} points")
 
-    def getObjectsTransformedToViewPortAndPPC(self) -> List[SGIObject]:
-        windowPos, objs2d = self.__perspectiveProjection(self.__world.objects)
-        #objs2d, windowPos = self.__world.objects, self.__window.getPositions()
-        windowPosition, objs = self.__convertObjectToPPC(objs2d, windowPos)
-        
-        self.__debugWindowPos = windowPosition
+        proxy = proxy.withPositions(self.__toViewPort(proxy.getPositionsArray()))
+    
+        if proxy.lines is not None:
+            proxy = proxy.withLines(self.__toViewPort(proxy.lines.reshape(-1, 3)))
 
-        clipped_objs = self.__clipper.clip(windowPosition, objs, self.__window.dimensions.length)
-        
-        objectsToShow: List[SGIObject] = []
-        
-        for obj in clipped_objs:
-            # Creates a copy to not change the Domain value
-            objCopy = deepcopy(obj)
-            print(f"Object {objCopy.name} has {len(objCopy.getPositions())} points")
+        return proxy
 
-            for position in objCopy.getPositions():
-                transformedPosition = self.__transformPositionToViewPort(position, windowPosition)
+    def getObjectsTransformedToViewPortAndPPC(self) -> List[RenderProxy]:
+        """
+        Render proxies of the objects of the world in viewport coordinates. The result of each object is cached with
+        its version and the camera state, so only the objects changed since the last frame are processed again
+        """
+        visibleObjects = self.__visibleObjects()
+        cameraKey = self.__window.cameraKey
 
-                position.axisX = transformedPosition.axisX + Constants.VIEWPORT_SLACK // 2
-                position.axisY = transformedPosition.axisY + Constants.VIEWPORT_SLACK // 2
-                position.axisZ = transformedPosition.axisZ
-        
-            if objCopy.type == ObjectsTypes.WIREFRAME and objCopy.is3D():
-                for line in objCopy.lines3D:
-                    posOne = line.pointOne.position
-                    posTwo = line.pointTwo.position
-
-                    transformedPosOne = self.__transformPositionToViewPort(posOne, windowPosition)
-                    line.pointOne.position.axisX = transformedPosOne.axisX + Constants.VIEWPORT_SLACK // 2
-                    line.pointOne.position.axisY = transformedPosOne.axisY + Constants.VIEWPORT_SLACK // 2
-                    line.pointOne.position.axisZ = transformedPosOne.axisZ
-
-                    transformedPosTwo = self.__transformPositionToViewPort(posTwo, windowPosition)
-                    line.pointTwo.position.axisX = transformedPosTwo.axisX + Constants.VIEWPORT_SLACK // 2
-                    line.pointTwo.position.axisY = transformedPosTwo.axisY + Constants.VIEWPORT_SLACK // 2
-                    line.pointTwo.position.axisZ = transformedPosTwo.axisZ
-
-            if objCopy.type == ObjectsTypes.SURFACE:
-                for line in objCopy.getLinesToDraw():
-                    posOne = line.pointOne.position
-                    posTwo = line.pointTwo.position
-
-                    transformedPosOne = self.__transformPositionToViewPort(posOne, windowPosition)
-                    line.pointOne.position.axisX = transformedPosOne.axisX + Constants.VIEWPORT_SLACK // 2
-                    line.pointOne.position.axisY = transformedPosOne.axisY + Constants.VIEWPORT_SLACK // 2
-                    line.pointOne.position.axisZ = transformedPosOne.axisZ
-
-                    transformedPosTwo = self.__transformPositionToViewPort(posTwo, windowPosition)
-                    line.pointTwo.position.axisX = transformedPosTwo.axisX + Constants.VIEWPORT_SLACK // 2
-                    line.pointTwo.position.axisY = transformedPosTwo.axisY + Constants.VIEWPORT_SLACK // 2
-                    line.pointTwo.position.axisZ = transformedPosTwo.axisZ
-
-            objectsToShow.append(objCopy)
+        staleObjects: List[SGIObject] = []
+        for obj in visibleObjects:
+            cached = self.__viewPortCache.get(obj.id)
+
+            if cached is None or cached[0] != obj.version or cached[1] != cameraKey:
+                staleObjects.append(obj)
+
+        # The projection already leaves the objects in PPC
+        objs = self.__projectObjects(staleObjects)
+        windowPosition = self.__window.positionsPPC
+
+        # All stale objects are clipped in a single call, the ones left out are stored as None
+        clipped = {proxy.id: proxy for proxy in self.__clipper.clip(windowPosition, objs, self.__window.dimensions.length)}
+
+        for source in staleObjects:
+            proxy = clipped.get(source.id)
+
+            self.__viewPortCache[source.id] = (source.version, cameraKey, None if proxy is None else self.__proxyToViewPort(proxy))
+
+        # Objects that left the view are dropped from the cache
+        visibleIds = {obj.id for obj in visibleObjects}
+        for objectId in [objectId for objectId in self.__viewPortCache if objectId not in visibleIds]:
+            del self.__viewPortCache[objectId]
+
+        objectsToShow: List[RenderProxy] = []
+
+        for obj in visibleObjects:
+            proxy = self.__viewPortCache[obj.id][2]
+
+            if proxy is not None:
+                objectsToShow.append(proxy)
 
         return objectsToShow
     
     def getObjectByName(self, name: str) -> SGIObject:
-        for obj in self.__world.objects:
-            if obj.name == name:
-                return obj
-
-        return None
\ No newline at end of file
+        return self.__world.getObjectByName(name)
\ No newline at end of file
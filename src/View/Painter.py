@@ -2,21 +2,17 @@ from typing import List
 from PyQt5.QtWidgets import QLabel
 from PyQt5.QtGui import QPainter, QColor, QColor, QPixmap, QPolygonF
 from PyQt5.QtCore import QPointF, Qt
-from Domain.Shapes.Surface import Surface
-from Domain.Shapes.Wireframe import WireFrame
-from Domain.Shapes.Curve import Curve
-from Domain.Shapes.Point import Point
-from Domain.Shapes.Line import Line
-from Domain.Shapes.SGIObject import SGIObject
+from Domain.Management.RenderProxy import RenderProxy
 from Domain.Utils.Enums import ObjectsTypes
 from Domain.Utils.Constants import Constants
 from Handlers.WorldHandler import WorldHandler
 from Domain.Utils.Coordinates import Position3D
+import numpy as np
 
 class Canvas(QLabel):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.__obj_list: List[SGIObject] = []
+        self.__obj_list: List[RenderProxy] = []
         
         pixmap = QPixmap(Constants.VIEWPORT_LENGTH + Constants.VIEWPORT_SLACK, Constants.VIEWPORT_WIDTH + Constants.VIEWPORT_SLACK)
         pixmap.fill(Qt.white)
@@ -24,7 +20,7 @@ class Canvas(QLabel):
         self.setPixmap(pixmap)
         self.setGeometry(Constants.SIDEBAR_SIZE, 0, Constants.VIEWPORT_LENGTH + Constants.VIEWPORT_SLACK, Constants.VIEWPORT_WIDTH + Constants.VIEWPORT_SLACK)
         
-    def draw(self, obj_list: List[SGIObject]):
+    def draw(self, obj_list: List[RenderProxy]):
         self.__obj_list = obj_list
         
         self.paint()
@@ -56,10 +52,6 @@ class Canvas(QLabel):
         painter.setPen(pen)
         
         windowCenterPoint = WorldHandler.getHandler().objectHandler.windowCenterPPC
-        slack = Constants.VIEWPORT_SLACK // 2
-        
-        windowCenterPoint.axisX += slack 
-        windowCenterPoint.axisY += slack 
 
         painter.drawPoint(windowCenterPoint.axisX, windowCenterPoint.axisY)
         painter.drawLine(windowCenterPoint.axisX - 5, windowCenterPoint.axisY, windowCenterPoint.axisX + 5, windowCenterPoint.axisY)
@@ -123,17 +115,19 @@ class Canvas(QLabel):
         self.pixmap().swap(new_pixmap)
             
     @classmethod
-    def __paintPoint(cls, canvas: QPainter, point: Point):
+    def __paintPoint(cls, canvas: QPainter, point: RenderProxy):
         #print(f'Pintando ponto em {point.position.axisX}, {point.position.axisY}')
 
         canvas.drawPoint(QPointF(point.position.axisX, point.position.axisY))
 
+    @classmethod
+    def __paintSegments(cls, canvas: QPainter, lines: np.ndarray):
+        for (x0, y0, _), (x1, y1, _) in lines.astype(int).tolist():
+            canvas.drawLine(x0, y0, x1, y1)
 
     @classmethod
-    def __paintLine(cls, canvas: QPainter, line: Line):
-        #print(f'Pintando linha de {line.pointOne.position.axisX}, {line.pointOne.position.axisY} para {line.pointTwo.position.axisX}, {line.pointTwo.position.axisY}')
-        canvas.drawLine(line.pointOne.position.axisX, line.pointOne.position.axisY,
-                        line.pointTwo.position.axisX, line.pointTwo.position.axisY)
+    def __paintLine(cls, canvas: QPainter, line: RenderProxy):
+        cls.__paintSegments(canvas, line.getPositionsArray()[:2].reshape(1, 2, 3))
     
     @classmethod
     def __drawWireframe(cls, canvas: QPainter, positions: list[Position3D], color: tuple[int, int, int], filled: bool = False):
@@ -159,18 +153,15 @@ class Canvas(QLabel):
             canvas.drawPolygon(QPolygonF([QPointF(x.axisX, x.axisY) for x in positions]))
             
     @classmethod
-    def __paintWireframe(cls, canvas: QPainter, wireFrame: WireFrame):
-        positions = wireFrame.getPositions()
-        
-        if wireFrame.is3D():
-            for line in wireFrame.lines3D:
-                canvas.drawLine(line.pointOne.position.axisX, line.pointOne.position.axisY, line.pointTwo.position.axisX, line.pointTwo.position.axisY)
+    def __paintWireframe(cls, canvas: QPainter, wireFrame: RenderProxy):
+        if wireFrame.lines is not None:
+            cls.__paintSegments(canvas, wireFrame.lines)
 
         else:
-            cls.__drawWireframe(canvas, positions, wireFrame.color, wireFrame.filled)
+            cls.__drawWireframe(canvas, wireFrame.getPositions(), wireFrame.color, wireFrame.filled)
         
     @classmethod
-    def __paintCurve(cls, canvas: QPainter, curve: Curve):
+    def __paintCurve(cls, canvas: QPainter, curve: RenderProxy):
         print(f'Pintando Curva')
         positions = curve.getPositions()
         
@@ -189,8 +180,7 @@ class Canvas(QLabel):
             canvas.drawLine(positions[n].axisX, positions[n].axisY, positions[n + 1].axisX, positions[n + 1].axisY)
             
     @classmethod
-    def __paintSurface(cls, canvas: QPainter, surface: Surface):
+    def __paintSurface(cls, canvas: QPainter, surface: RenderProxy):
         print(f'Pintando Superfície')
-        for line in surface.getLinesToDraw():
-            canvas.drawLine(line.pointOne.position.axisX, line.pointOne.position.axisY, line.pointTwo.position.axisX, line.pointTwo.position.axisY)
-            
\ No newline at end of file
+        if surface.lines is not None:
+            cls.__paintSegments(canvas, surface.lines)
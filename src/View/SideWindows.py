@@ -10,6 +10,7 @@ from View.Button import Button
 from typing import List
 from Domain.Utils.Enums import CurvePlottingMethods
 import math
+import re
 
 # Returns a function that creates a new window according to the object given
 class ObjectWindowFactory:
@@ -307,24 +308,27 @@ class ObjectWindowFactory:
         window.show()
         
     def __createSurfaceWindow(self):
-        def parsePoints(input: str) -> List[Position3D]:
-            control_points = []
-            rows = input.split(';')
-            for row in rows:
-                points = row.split(',')
-                points = [tuple(map(int, p.strip('()').split(','))) for p in points]
-                control_points.append(points)
-            
-            control_positions = []
-            for points in control_points:
-                x1, y1, z1 = points[0][0], points[1][0], points[2][0]
-                x2, y2, z2 = points[3][0], points[4][0], points[5][0]
-                x3, y3, z3 = points[6][0], points[7][0], points[8][0]
-                x4, y4, z4 = points[9][0], points[10][0], points[11][0]
-                
-                control_positions += [Position3D(x1, y1, z1), Position3D(x2, y2, z2), Position3D(x3, y3, z3), Position3D(x4, y4, z4)]   
-            
-            return control_positions
+        def parsePoints(input: str) -> tuple[List[Position3D], int]:
+            """ Control net written row by row, rows separated by ';'. Returns the positions and the number of columns """
+            control_rows = []
+
+            for row in input.split(';'):
+                points = re.findall(r'\(([^)]*)\)', row)
+                control_rows.append([Position3D(*map(float, point.split(','))) for point in points])
+
+            columns = len(control_rows[0])
+
+            if any(len(row) != columns for row in control_rows):
+                print('Todas as linhas da malha de controle precisam ter o mesmo número de pontos')
+                return [], 0
+
+            return [position for row in control_rows for position in row], columns
+
+        def addSurface(input: str, strategy: CurvePlottingMethods) -> None:
+            positions, columns = parsePoints(input)
+
+            if columns > 0:
+                WorldHandler.getHandler().objectHandler.addSurface(positions, strategy=strategy, columns=columns)
         
         window = QMainWindow(self.__parent)
         window.setWindowTitle("Criar Superfície")
@@ -338,15 +342,21 @@ class ObjectWindowFactory:
         # Label
         # Example: (0,0,0),(20,0,0),(40,0,0),(60,0,0);(0,20,20),(20,20,20),(40,20,20),(60,20,20);(0,40,40),(20,40,40),(40,40,40),(60,40,40);(0,60,60),(20,60,60),(40,60,60),(60,60,60)
         # (0,0,0),(120,0,0),(240,0,0),(360,0,0);(0,120,120),(120,120,120),(240,120,120),(360,120,120);(0,240,240),(120,240,240),(240,240,240),(360,240,240);(0,360,360),(120,360,360),(240,360,360),(360,360,360)
-        label = QLabel("Insira os pontos de controle separdos por ';' no formato \n(x_11,y_11,z_11),(x_12,y_12,z_12),...;(x_21,y_21,z_21),(x_22,y_22,z_22),...;...(x_ij,y_ij,z_ij):")
+        label = QLabel("Insira os pontos de controle separdos por ';' no formato \n(x_11,y_11,z_11),(x_12,y_12,z_12),...;(x_21,y_21,z_21),(x_22,y_22,z_22),...;...(x_ij,y_ij,z_ij).\nBezier: 3k + 1 pontos por linha e por coluna, B-spline: pelo menos 4:")
         layout.addWidget(label)
         
         # Text field
         text_field = QLineEdit()
         layout.addWidget(text_field)
         
+        # Strategy of the patches
+        strategy_combo = QComboBox()
+        strategy_combo.addItem(CurvePlottingMethods.BEZIER.value)
+        strategy_combo.addItem(CurvePlottingMethods.BSPLINE.value)
+        layout.addWidget(strategy_combo)
+        
         # Confirm button
-        confirm_button = Button("Confirmar", lambda: (WorldHandler.getHandler().objectHandler.addSurface(parsePoints(text_field.text())), window.close(), self.__parent.update()))
+        confirm_button = Button("Confirmar", lambda: (addSurface(text_field.text(), CurvePlottingMethods.convertFromString(strategy_combo.currentText())), window.close(), self.__parent.update()))
         layout.addWidget(confirm_button)
         
         window.show()
@@ -512,18 +522,18 @@ class ObjectTransformWindow(QMainWindow):
         self.show()
 
     def __confirmTransformations(self):
-        transform = GenericTransform(positions=self.__obj.getPositions())
+        transform = GenericTransform()
         transform.add_transforms(self.__transforms)
         
-        final_positions = transform.execute()
+        final_positions = transform.apply(self.__obj)
         
         print(f"Initial positions: {[position.homogenous() for position in self.__obj.getPositions()]}")
                   
         print(f"Final matrix for {[transform.getName() for transform in self.__transforms]}: {transform.matrix()}") 
         
-        print(f"Final positions: {[position.homogenous() for position in final_positions]}")  
+        print(f"Final positions: {final_positions}")  
 
-        self.__obj.setPositions(final_positions)
+        self.__obj.setPositionsArray(final_positions)
 
         self.close()
 
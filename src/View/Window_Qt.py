@@ -4,7 +4,7 @@ from PyQt5.QtCore import Qt, QSize
 from Domain.Shapes.Curve import Curve
 from Domain.Shapes.Line import Line
 from Domain.Shapes.Point import Point
-from Domain.Utils.Enums import ClippingMethods, CurvePlottingMethods
+from Domain.Utils.Enums import ClippingMethods, CullingMethods, CurvePlottingMethods, ProjectionMethods, SurfaceEvaluationMethods, TessellationMethods
 from View.Button import Button
 from View.Console import Console
 from View.ArrowButtonWidget import ArrowButtonWidget
@@ -32,15 +32,18 @@ class Window_Qt(QMainWindow):
         tests_folder = os.path.join(os.getcwd(), "tests")
 
         # Iterate over all files in the tests folder
+        wireframes = []
         for file_name in os.listdir(tests_folder):
             # Check if the file is an .obj file
             if file_name.endswith(".obj"):
                 # Construct the full path to the .obj file
                 obj_file_path = os.path.join(tests_folder, file_name)
                 
-                # Read the .obj file and add it to the object handler
-                wireframe = DescriptorOBJ.readOBJFile(obj_file_path)
-                WorldHandler.getHandler().objectHandler.addObject(wireframe)
+                # Read the .obj file
+                wireframes.append(DescriptorOBJ.readOBJFile(obj_file_path))
+
+        # Add all of them to the object handler at once
+        WorldHandler.getHandler().objectHandler.addObjects(wireframes)
 
         # Add a curve
         curveP1 = Point(110, 30, 1)
@@ -210,12 +213,62 @@ class Window_Qt(QMainWindow):
         clippingDropdown = QComboBox()
         clippingDropdown.addItem(ClippingMethods.COHEN.value)
         clippingDropdown.addItem(ClippingMethods.LIANG.value)
+        clippingDropdown.addItem(ClippingMethods.WEILER_ATHERTON.value)
+        clippingDropdown.addItem(ClippingMethods.SUTHERLAND_HODGMAN.value)
         
         changeClipButton = Button("Aplicar", lambda: (self.__changeClipping(clippingDropdown.currentText())))
 
         rotate_window_box.layout().addWidget(clippingLabel)
         rotate_window_box.layout().addWidget(clippingDropdown)
         rotate_window_box.layout().addWidget(changeClipButton)
+
+        # Add the projection method
+        projectionLabel = QLabel("Tipo de Projeção: ")
+        projectionDropdown = QComboBox()
+        projectionDropdown.addItem(ProjectionMethods.PERSPECTIVE.value)
+        projectionDropdown.addItem(ProjectionMethods.PARALLEL.value)
+        
+        changeProjectionButton = Button("Aplicar", lambda: (self.__changeProjection(projectionDropdown.currentText())))
+
+        rotate_window_box.layout().addWidget(projectionLabel)
+        rotate_window_box.layout().addWidget(projectionDropdown)
+        rotate_window_box.layout().addWidget(changeProjectionButton)
+
+        # Add the culling method
+        cullingLabel = QLabel("Culling: ")
+        cullingDropdown = QComboBox()
+        cullingDropdown.addItem(CullingMethods.NONE.value)
+        cullingDropdown.addItem(CullingMethods.BACK_FACE.value)
+        
+        changeCullingButton = Button("Aplicar", lambda: (self.__changeCulling(cullingDropdown.currentText())))
+
+        rotate_window_box.layout().addWidget(cullingLabel)
+        rotate_window_box.layout().addWidget(cullingDropdown)
+        rotate_window_box.layout().addWidget(changeCullingButton)
+
+        # Add the tessellation method of the curves
+        tessellationLabel = QLabel("Tesselação das curvas: ")
+        tessellationDropdown = QComboBox()
+        tessellationDropdown.addItem(TessellationMethods.FIXED_STEP.value)
+        tessellationDropdown.addItem(TessellationMethods.ADAPTIVE.value)
+        
+        changeTessellationButton = Button("Aplicar", lambda: (self.__changeTessellation(tessellationDropdown.currentText())))
+
+        rotate_window_box.layout().addWidget(tessellationLabel)
+        rotate_window_box.layout().addWidget(tessellationDropdown)
+        rotate_window_box.layout().addWidget(changeTessellationButton)
+
+        # Add the evaluation method of the surfaces
+        surfaceEvaluationLabel = QLabel("Avaliação das superfícies: ")
+        surfaceEvaluationDropdown = QComboBox()
+        surfaceEvaluationDropdown.addItem(SurfaceEvaluationMethods.DIRECT.value)
+        surfaceEvaluationDropdown.addItem(SurfaceEvaluationMethods.FORWARD_DIFFERENCES.value)
+        
+        changeSurfaceEvaluationButton = Button("Aplicar", lambda: (self.__changeSurfaceEvaluation(surfaceEvaluationDropdown.currentText())))
+
+        rotate_window_box.layout().addWidget(surfaceEvaluationLabel)
+        rotate_window_box.layout().addWidget(surfaceEvaluationDropdown)
+        rotate_window_box.layout().addWidget(changeSurfaceEvaluationButton)
                 
     def __addSidebarObjBox(self, title: str, items: list):
         box = QGroupBox(title, self.__sidebar)
@@ -254,6 +307,30 @@ class Window_Qt(QMainWindow):
 
         WorldHandler.getHandler().objectHandler.setClippingMethod(clippingMethod)
 
+    def __changeProjection(self, projectionMethodStr: str) -> None:
+        projectionMethod: ProjectionMethods = ProjectionMethods.convertFromString(projectionMethodStr)
+
+        WorldHandler.getHandler().window.setProjectionMethod(projectionMethod)
+        self.update()
+
+    def __changeCulling(self, cullingMethodStr: str) -> None:
+        cullingMethod: CullingMethods = CullingMethods.convertFromString(cullingMethodStr)
+
+        WorldHandler.getHandler().objectHandler.setCullingMethod(cullingMethod)
+        self.update()
+
+    def __changeTessellation(self, tessellationMethodStr: str) -> None:
+        tessellationMethod: TessellationMethods = TessellationMethods.convertFromString(tessellationMethodStr)
+
+        WorldHandler.getHandler().objectHandler.setTessellationMethod(tessellationMethod)
+        self.update()
+
+    def __changeSurfaceEvaluation(self, surfaceEvaluationMethodStr: str) -> None:
+        surfaceEvaluationMethod: SurfaceEvaluationMethods = SurfaceEvaluationMethods.convertFromString(surfaceEvaluationMethodStr)
+
+        WorldHandler.getHandler().objectHandler.setSurfaceEvaluationMethod(surfaceEvaluationMethod)
+        self.update()
+
     def __rotateWindow(self, angle: float, axis: str = "Z") -> None:
         WorldHandler.getHandler().rotateWindow(angle, axis)
         self.update()
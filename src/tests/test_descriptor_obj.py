@@ -0,0 +1,35 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Domain.Utils.DescriptorOBJ import DescriptorOBJ
+import numpy as np
+import pytest
+
+
+def writeOBJ(folder, text: str) -> str:
+    path = os.path.join(folder, "mesh.obj")
+
+    with open(path, "w") as file:
+        file.write(text)
+
+    return path
+
+
+def testCommentsAfterTheData(tmp_path):
+    path = writeOBJ(str(tmp_path), "o mesh # the name\nv 0 0 0 # note\nv 1 0 0\nv 0 1 0#glued\nf 1 2 3 # face\n# only a comment\n")
+
+    name, vertices, faces, groups = DescriptorOBJ.parseOBJFile(path)
+
+    assert name == "mesh"
+    assert np.array_equal(vertices, [[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    assert faces.tolist() == [[0, 1, 2]]
+    assert groups == [("mesh", 0)]
+
+
+def testFileWithoutVertices(tmp_path):
+    path = writeOBJ(str(tmp_path), "# nothing here\no empty\n")
+
+    with pytest.raises(ValueError, match="mesh.obj has no vertices"):
+        DescriptorOBJ.readOBJFile(path, useCache=False)
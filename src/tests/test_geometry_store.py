@@ -0,0 +1,38 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Domain.Management.GeometryStore import GeometryStore
+import numpy as np
+
+
+def testCompactionWhileAllocatingKeepsTheCounts():
+    """ The 65th object grows the slots and compacts the buffer in the same allocation """
+    store = GeometryStore()
+
+    for objectId in range(64):
+        store.allocate(objectId, np.full((15, 3), objectId, dtype=np.float64))
+
+    store.allocate(64, np.full((100, 3), 64, dtype=np.float64))
+
+    assert store.vertexCount == 64 * 15 + 100
+    assert len(store.vertices) == 64 * 15 + 100
+
+    for objectId in range(65):
+        assert np.all(store.getVertices(objectId) == objectId)
+
+
+def testCompactionAfterReleaseDropsTheGarbage():
+    store = GeometryStore()
+
+    for objectId in range(70):
+        store.allocate(objectId, np.full((15, 3), objectId, dtype=np.float64))
+
+    store.release(3)
+    # Does not fit in the buffer, so the garbage of the released object is dropped
+    store.allocate(70, np.full((5000, 3), 70, dtype=np.float64))
+
+    assert store.vertexCount == 69 * 15 + 5000
+    assert len(store.vertices) == store.vertexCount
+    assert np.all(store.getVertices(70) == 70) and np.all(store.getVertices(69) == 69)
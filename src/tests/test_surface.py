@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Domain.Shapes.Surface import Surface
+from Domain.Utils.Enums import CurvePlottingMethods, SurfaceEvaluationMethods
+import numpy as np
+import pytest
+
+
+def bezierNet(size: int) -> np.ndarray:
+    rows, columns = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+    heights = np.sin(rows * 0.7) * np.cos(columns * 0.4) * 20
+
+    return np.stack([columns * 10.0, rows * 10.0, heights], axis=2)
+
+
+@pytest.mark.parametrize("method", list(SurfaceEvaluationMethods))
+@pytest.mark.parametrize("step", [0.3, 0.07, 0.1])
+def testSeamsAndCornersMatchTheControlNet(step: float, method: SurfaceEvaluationMethods):
+    """ Steps that do not divide 1 must still end every patch on its border """
+    net = bezierNet(7)
+    surface = Surface("Superfície", net.reshape(-1, 3), strategy=CurvePlottingMethods.BEZIER, columns=7)
+
+    grid, _ = surface.generateGrid(step, method)
+    samples = int(np.ceil(1 / step - 1e-9)) + 1
+
+    assert grid.shape == (2 * samples - 1, 2 * samples - 1, 3)
+
+    # Corners of the 2 x 2 patches, including the seams between them
+    seams = [0, samples - 1, 2 * samples - 2]
+
+    for gridRow, netRow in zip(seams, [0, 3, 6]):
+        for gridColumn, netColumn in zip(seams, [0, 3, 6]):
+            assert np.allclose(grid[gridRow, gridColumn], net[netRow, netColumn])
+
+
+def testForwardDifferencesMatchDirectEvaluation():
+    surface = Surface("Superfície", bezierNet(7).reshape(-1, 3), strategy=CurvePlottingMethods.BEZIER, columns=7)
+
+    direct, _ = surface.generateGrid(0.07, SurfaceEvaluationMethods.DIRECT)
+    forward, _ = surface.generateGrid(0.07, SurfaceEvaluationMethods.FORWARD_DIFFERENCES)
+
+    assert np.allclose(direct, forward)